@@ -0,0 +1,486 @@
+"""
+Local SQLite catalog of Caravan videos.
+
+One row per video, keyed by Vimeo ID and OTT ID (the slug at the end of the
+OTT video page link), with the fields the workbooks carry. Import adapters
+merge the existing sources into it (catalog workbooks, the VHX videos.csv
+export and the Vimeo all_english_videos.json listing), and export adapters
+write it back out as CSV or into an existing workbook. Lookups, joins and
+"what still needs a transcript / tags" questions are then indexed queries
+instead of full workbook loads (see PENDING and planner.py).
+
+Column names match the sheet_schema field names, so a sheet imports by header.
+
+Usage:
+    python common/catalog.py <file.xlsx|file.csv|file.json> [...]
+"""
+
+import csv
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+
+from sheet_reader import find_sheet_name, iter_rows
+from sheet_schema import load_schema, iter_records, read_headers
+from sheet_writer import SheetWriter
+
+CATALOG_PATH = os.getenv('CATALOG_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'catalog.sqlite'))
+
+# Fields kept for each video, in export order
+FIELDS = (
+    'video_name', 'category', 'series', 'teacher', 'video_length', 'language',
+    'description', 'vimeo_link', 'ott_link', 'internal_url', 'transcript', 'tags',
+)
+
+# What each video may still need. Each predicate has a matching partial index,
+# so listing pending work costs O(pending) rather than O(catalog).
+PENDING = {
+    'transcript': "transcript IS NULL AND vimeo_id IS NOT NULL",
+    # Tags are saved and exported by Vimeo ID, so OTT-only rows can't take them
+    'tags': "tags IS NULL AND transcript IS NOT NULL AND vimeo_id IS NOT NULL",
+}
+
+# Column positions the scripts used before columns were found by header.
+# Passed as `columns` so a header that matches no sheet_schema alias still
+# resolves (1-based; 'tags' is the first of MAX_TAGS tag columns).
+RAG_LIST_COLUMNS = {
+    'category': 3, 'video_name': 4, 'video_length': 5, 'teacher': 6,
+    'description': 15, 'vimeo_link': 26, 'transcript': 27, 'tags': 28,
+}
+TAGS_LIST_COLUMNS = {
+    'video_name': 4, 'series': 5, 'teacher': 7, 'description': 9,
+    'vimeo_link': 20, 'transcript': 21,
+}
+MAX_TAGS = 10
+
+# Tag_01, Tag 2, Tags ... (create_tags writes one tag per column)
+TAG_HEADER_RE = re.compile(r'^tags?[\s_]*\d*$')
+VIMEO_ID_RE = re.compile(r'vimeo\.com/(?:video/|videos/)?(\d+)|^/videos/(\d+)')
+
+
+def connect(path=CATALOG_PATH):
+    """Open (and create if needed) the catalog database"""
+    connection = sqlite3.connect(path)
+    connection.row_factory = sqlite3.Row
+    connection.execute("""
+        CREATE TABLE IF NOT EXISTS videos (
+            id INTEGER PRIMARY KEY,
+            vimeo_id TEXT UNIQUE,
+            ott_id TEXT UNIQUE,
+            updated_at REAL NOT NULL
+        )
+    """)
+    connection.execute("""
+        CREATE TABLE IF NOT EXISTS sources (
+            path TEXT PRIMARY KEY,
+            mtime REAL NOT NULL
+        )
+    """)
+    # Which videos each imported workbook holds, so pending work can be
+    # limited to the workbook a script is filling in
+    connection.execute("""
+        CREATE TABLE IF NOT EXISTS source_videos (
+            path TEXT NOT NULL,
+            video_id INTEGER NOT NULL,
+            PRIMARY KEY (path, video_id)
+        )
+    """)
+    # JSON object of field -> content_hash of the value last sent to Vimeo.
+    # Kept apart from videos: pushed videos needn't be in any catalog workbook.
+    connection.execute("""
+        CREATE TABLE IF NOT EXISTS pushes (
+            vimeo_id TEXT PRIMARY KEY,
+            hashes TEXT NOT NULL
+        )
+    """)
+
+    # Add any columns introduced since the catalog was created
+    existing = {row['name'] for row in connection.execute("PRAGMA table_info(videos)")}
+    for column in FIELDS:
+        if column not in existing:
+            connection.execute(f"ALTER TABLE videos ADD COLUMN {column} TEXT")
+
+    # Older catalogs kept push hashes on the video row, creating an otherwise
+    # empty row for each pushed video; move the hashes and drop those rows
+    if 'pushed_hashes' in existing:
+        connection.execute("INSERT OR IGNORE INTO pushes (vimeo_id, hashes) "
+                           "SELECT vimeo_id, pushed_hashes FROM videos "
+                           "WHERE pushed_hashes IS NOT NULL AND vimeo_id IS NOT NULL")
+        empty = ' AND '.join(f"{field} IS NULL" for field in FIELDS)
+        connection.execute(f"DELETE FROM videos WHERE pushed_hashes IS NOT NULL AND ott_id IS NULL AND {empty}")
+        connection.execute("UPDATE videos SET pushed_hashes = NULL WHERE pushed_hashes IS NOT NULL")
+
+    # Rebuild pending indexes whose predicate changed, and drop those of removed tasks
+    indexes = {row['name']: row['sql'] for row in connection.execute(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND name LIKE 'videos_pending_%'")}
+    for task, predicate in PENDING.items():
+        name = f"videos_pending_{task}"
+        sql = f"CREATE INDEX {name} ON videos (id) WHERE {predicate}"
+        if indexes.pop(name, None) != sql:
+            connection.execute(f"DROP INDEX IF EXISTS {name}")
+            connection.execute(sql)
+    for name in indexes:
+        connection.execute(f"DROP INDEX {name}")
+    connection.commit()
+    return connection
+
+
+def vimeo_id_from_link(link):
+    """Numeric Vimeo ID from a vimeo.com link or /videos/{id} URI"""
+    if not link:
+        return None
+    match = VIMEO_ID_RE.search(str(link).strip())
+    if match:
+        return match.group(1) or match.group(2)
+    return None
+
+
+def ott_id_from_link(link):
+    """Slug at the end of an OTT video page link"""
+    if not link:
+        return None
+    slug = str(link).strip().rstrip('/').rsplit('/', 1)[-1]
+    return slug or None
+
+
+def _clean(value):
+    if value is None:
+        return None
+    if isinstance(value, (list, tuple)):
+        return json.dumps(list(value), ensure_ascii=False) if value else None
+    value = str(value).strip()
+    return value or None
+
+
+def upsert(connection, vimeo_id=None, ott_id=None, **fields):
+    """
+    Merge one video into the catalog.
+
+    The row is matched on vimeo_id, then ott_id. Empty values never
+    overwrite what is already stored.
+
+    Returns:
+        Catalog row id, or None if the video has neither ID
+    """
+    if not vimeo_id and not ott_id:
+        return None
+
+    values = {field: _clean(value) for field, value in fields.items() if field in FIELDS}
+    values = {field: value for field, value in values.items() if value is not None}
+
+    existing = None
+    if vimeo_id:
+        existing = connection.execute("SELECT id, vimeo_id, ott_id FROM videos WHERE vimeo_id = ?", (vimeo_id,)).fetchone()
+    if existing is None and ott_id:
+        existing = connection.execute("SELECT id, vimeo_id, ott_id FROM videos WHERE ott_id = ?", (ott_id,)).fetchone()
+
+    now = time.time()
+    if existing is None:
+        values.update({'vimeo_id': vimeo_id, 'ott_id': ott_id, 'updated_at': now})
+        columns = ', '.join(values)
+        placeholders = ', '.join('?' for _ in values)
+        cursor = connection.execute(f"INSERT INTO videos ({columns}) VALUES ({placeholders})", tuple(values.values()))
+        return cursor.lastrowid
+
+    if vimeo_id and not existing['vimeo_id']:
+        values['vimeo_id'] = vimeo_id
+    if ott_id and not existing['ott_id']:
+        values['ott_id'] = ott_id
+    values['updated_at'] = now
+    assignments = ', '.join(f"{field} = ?" for field in values)
+    connection.execute(f"UPDATE videos SET {assignments} WHERE id = ?", tuple(values.values()) + (existing['id'],))
+    return existing['id']
+
+
+def update(connection, vimeo_id, **fields):
+    """Set fields on the video with this Vimeo ID (empty values clear the field)"""
+    values = {field: _clean(value) for field, value in fields.items() if field in FIELDS}
+    values['updated_at'] = time.time()
+    assignments = ', '.join(f"{field} = ?" for field in values)
+    connection.execute(f"UPDATE videos SET {assignments} WHERE vimeo_id = ?", tuple(values.values()) + (vimeo_id,))
+    connection.commit()
+
+
+def get(connection, vimeo_id=None, ott_id=None):
+    """Catalog row for a Vimeo ID or OTT ID, or None"""
+    if vimeo_id:
+        return connection.execute("SELECT * FROM videos WHERE vimeo_id = ?", (vimeo_id,)).fetchone()
+    return connection.execute("SELECT * FROM videos WHERE ott_id = ?", (ott_id,)).fetchone()
+
+
+def content_hash(value):
+    """Hash of a metadata value, ignoring line-ending and edge whitespace differences"""
+    if isinstance(value, str):
+        text = value.replace('\r\n', '\n').strip()
+    else:
+        text = json.dumps(value, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def pushed_hashes(connection, vimeo_id):
+    """Hashes of the metadata last pushed to Vimeo, or None if nothing is on record"""
+    row = connection.execute("SELECT hashes FROM pushes WHERE vimeo_id = ?", (vimeo_id,)).fetchone()
+    if row is None:
+        return None
+    return json.loads(row['hashes'])
+
+
+def changed_fields(data, hashes):
+    """The fields of data whose content differs from the recorded hashes"""
+    return {field: value for field, value in data.items() if hashes.get(field) != content_hash(value)}
+
+
+def record_push(connection, vimeo_id, data):
+    """Remember that these field values are now live on Vimeo"""
+    if not data:
+        return
+    hashes = pushed_hashes(connection, vimeo_id) or {}
+    hashes.update({field: content_hash(value) for field, value in data.items()})
+
+    connection.execute("INSERT OR REPLACE INTO pushes (vimeo_id, hashes) VALUES (?, ?)",
+                       (vimeo_id, json.dumps(hashes, sort_keys=True)))
+    connection.commit()
+
+
+def source_vimeo_ids(connection, source):
+    """Vimeo IDs of the videos on an imported workbook"""
+    rows = connection.execute("SELECT videos.vimeo_id FROM videos JOIN source_videos ON source_videos.video_id = videos.id "
+                              "WHERE source_videos.path = ? AND videos.vimeo_id IS NOT NULL", (os.path.abspath(source),))
+    return {row['vimeo_id'] for row in rows}
+
+
+def _pending_where(task, source):
+    """WHERE clause and parameters for a PENDING task, optionally limited to one workbook"""
+    if source is None:
+        return PENDING[task], ()
+    return (f"{PENDING[task]} AND id IN (SELECT video_id FROM source_videos WHERE path = ?)",
+            (os.path.abspath(source),))
+
+
+def pending(connection, task, limit=None, source=None):
+    """
+    Videos that still need a task from PENDING, in catalog order.
+
+    Args:
+        source: Only videos on this imported workbook (None for the whole catalog)
+    """
+    where, params = _pending_where(task, source)
+    query = f"SELECT * FROM videos WHERE {where} ORDER BY id"
+    if limit:
+        query += f" LIMIT {int(limit)}"
+    return connection.execute(query, params).fetchall()
+
+
+def count_pending(connection, task, source=None):
+    where, params = _pending_where(task, source)
+    return connection.execute(f"SELECT COUNT(*) FROM videos WHERE {where}", params).fetchone()[0]
+
+
+def needs_transcript(connection, source=None):
+    """Videos on Vimeo with no transcript yet"""
+    return pending(connection, 'transcript', source=source)
+
+
+def needs_tags(connection, source=None):
+    """Videos that have a transcript but no tags yet"""
+    return pending(connection, 'tags', source=source)
+
+
+def import_sheet(connection, file_path, sheet_contains='english video list', columns=None):
+    """
+    Merge a catalog workbook into the catalog, matching columns by header.
+
+    Args:
+        columns: Fallback column per field for headers that don't match
+                 (RAG_LIST_COLUMNS, TAGS_LIST_COLUMNS)
+
+    Returns:
+        Number of rows imported
+    """
+    sheet_name = find_sheet_name(file_path, sheet_contains)
+    if not sheet_name:
+        print(f"ERROR: Could not find '{sheet_contains}' sheet in {file_path}")
+        return 0
+
+    columns = columns or {}
+    schema = load_schema(file_path, sheet_name, {field: columns.get(field) for field in FIELDS if field != 'tags'})
+    headers = read_headers(file_path, sheet_name)
+    tag_columns = [index for index, header in enumerate(headers) if TAG_HEADER_RE.match(header)]
+    if not tag_columns and columns.get('tags'):
+        tag_columns = list(range(columns['tags'] - 1, columns['tags'] - 1 + MAX_TAGS))
+
+    source = os.path.abspath(file_path)
+    count = 0
+    with connection:
+        connection.execute("DELETE FROM source_videos WHERE path = ?", (source,))
+        for row_number, values in iter_rows(file_path, sheet_name):
+            fields = schema.record(row_number, values)._asdict()
+            fields.pop('row_number')
+            vimeo_id = vimeo_id_from_link(fields.get('vimeo_link'))
+            ott_id = ott_id_from_link(fields.get('ott_link'))
+
+            tags = [values[index] for index in tag_columns if index < len(values) and values[index]]
+            if tags:
+                fields['tags'] = tags
+            video_id = upsert(connection, vimeo_id, ott_id, **fields)
+            if video_id:
+                connection.execute("INSERT OR IGNORE INTO source_videos (path, video_id) VALUES (?, ?)",
+                                   (source, video_id))
+                count += 1
+
+    print(f"Imported {count} rows from {file_path}")
+    return count
+
+
+def _source_changed(connection, file_path):
+    path = os.path.abspath(file_path)
+    row = connection.execute("SELECT mtime FROM sources WHERE path = ?", (path,)).fetchone()
+    if row is None or row['mtime'] != os.path.getmtime(file_path):
+        return True
+    # Imported before source_videos existed: read it again to learn its rows
+    return connection.execute("SELECT 1 FROM source_videos WHERE path = ? LIMIT 1", (path,)).fetchone() is None
+
+
+def _record_source(connection, file_path):
+    connection.execute("INSERT OR REPLACE INTO sources (path, mtime) VALUES (?, ?)",
+                       (os.path.abspath(file_path), os.path.getmtime(file_path)))
+    connection.commit()
+
+
+def sync_sheet(connection, file_path, sheet_contains='english video list', columns=None):
+    """Import a workbook only if it changed since it was last imported or exported"""
+    if not _source_changed(connection, file_path):
+        print(f"Catalog is up to date with {file_path}")
+        return 0
+    count = import_sheet(connection, file_path, sheet_contains, columns)
+    _record_source(connection, file_path)
+    return count
+
+
+def import_videos_csv(connection, csv_path):
+    """Merge the VHX export written by fetch_videos.py (sheets/videos.csv)"""
+    count = 0
+    with connection, open(csv_path, 'r', encoding='utf-8-sig') as f:
+        for row in csv.DictReader(f):
+            page_link = (row.get('Video Page Link') or '').strip()
+            if upsert(connection, None, ott_id_from_link(page_link),
+                      video_name=row.get('Title'),
+                      description=row.get('Description'),
+                      internal_url=row.get('Video Link'),
+                      ott_link=page_link):
+                count += 1
+
+    print(f"Imported {count} rows from {csv_path}")
+    return count
+
+
+def import_vimeo_json(connection, json_path):
+    """Merge a Vimeo listing saved by get_video_list.py (all_english_videos.json)"""
+    with open(json_path, 'r', encoding='utf-8') as f:
+        videos = json.load(f).get('data', [])
+
+    count = 0
+    with connection:
+        for video in videos:
+            vimeo_id = vimeo_id_from_link(video.get('uri'))
+            if upsert(connection, vimeo_id, None,
+                      video_name=video.get('name'),
+                      description=video.get('description'),
+                      vimeo_link=video.get('link') or (f"https://vimeo.com/{vimeo_id}" if vimeo_id else None)):
+                count += 1
+
+    print(f"Imported {count} videos from {json_path}")
+    return count
+
+
+def import_file(connection, path):
+    """Import any supported source, chosen by file extension"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.xlsx':
+        return import_sheet(connection, path)
+    if extension == '.csv':
+        return import_videos_csv(connection, path)
+    if extension == '.json':
+        return import_vimeo_json(connection, path)
+    print(f"ERROR: Don't know how to import {path}")
+    return 0
+
+
+def _export_value(row, field):
+    value = row[field]
+    if field == 'tags' and value:
+        return ','.join(json.loads(value))
+    return value
+
+
+def export_csv(connection, csv_path, fields=FIELDS):
+    """Write the whole catalog to a CSV file"""
+    rows = connection.execute("SELECT * FROM videos ORDER BY id").fetchall()
+    with open(csv_path, 'w', newline='', encoding='utf-8-sig') as f:
+        writer = csv.writer(f)
+        writer.writerow(('vimeo_id', 'ott_id') + tuple(fields))
+        for row in rows:
+            writer.writerow([row['vimeo_id'], row['ott_id']] + [_export_value(row, field) for field in fields])
+
+    print(f"Exported {len(rows)} videos to {csv_path}")
+    return len(rows)
+
+
+def export_sheet(connection, file_path, fields, sheet_contains='english video list', columns=None):
+    """
+    Write catalog values into an existing workbook, matching rows by Vimeo link.
+
+    Only empty cells are filled, so values already in the sheet are never
+    overwritten, and the workbook is saved once at the end. columns gives
+    fallback positions as for import_sheet.
+
+    Returns:
+        Number of cells updated
+    """
+    sheet_name = find_sheet_name(file_path, sheet_contains)
+    if not sheet_name:
+        print(f"ERROR: Could not find '{sheet_contains}' sheet in {file_path}")
+        return 0
+
+    columns = columns or {}
+    schema = load_schema(file_path, sheet_name, {field: columns.get(field) for field in ('vimeo_link',) + tuple(fields)})
+    was_synced = not _source_changed(connection, file_path)
+    changed = 0
+    with SheetWriter(None, file_path) as writer:
+        for record in iter_records(file_path, sheet_name, schema):
+            row = get(connection, vimeo_id=vimeo_id_from_link(record.vimeo_link))
+            if row is None:
+                continue
+            for field in fields:
+                if field not in schema.columns or row[field] is None:
+                    continue
+                if _clean(getattr(record, field)) is not None:
+                    continue
+                if field == 'tags':
+                    # One tag per column, starting at the first tag column
+                    for index, tag in enumerate(json.loads(row[field])):
+                        writer.set(sheet_name, record.row_number, schema.column(field) + index, tag)
+                        changed += 1
+                else:
+                    writer.set(sheet_name, record.row_number, schema.column(field), row[field])
+                    changed += 1
+
+    # A workbook that was in sync still is, so the next sync_sheet can skip it
+    if was_synced:
+        _record_source(connection, file_path)
+    print(f"Updated {changed} cells in {file_path}")
+    return changed
+
+
+if __name__ == '__main__':
+    connection = connect()
+    for path in sys.argv[1:]:
+        import_file(connection, path)
+    total = connection.execute("SELECT COUNT(*) FROM videos").fetchone()[0]
+    print(f"Catalog: {total} videos")
+    for task in PENDING:
+        print(f"  {count_pending(connection, task)} need {task}")
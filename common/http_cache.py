@@ -0,0 +1,161 @@
+"""
+Persistent on-disk cache for GET responses.
+
+Entries are stored in a SQLite file keyed by URL and auth scope (a hash of
+the credentials used, never the credentials themselves). A fresh entry is
+returned without touching the network; a stale one is revalidated with
+If-None-Match / If-Modified-Since so an unchanged resource costs a 304.
+The least recently used entries are evicted once the cache grows past
+HTTP_CACHE_MAX_MB.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+CACHE_PATH = os.getenv('HTTP_CACHE_PATH', '.http_cache.sqlite')
+MAX_BYTES = int(float(os.getenv('HTTP_CACHE_MAX_MB', '256')) * 1024 * 1024)
+DEFAULT_TTL = 24 * 60 * 60
+
+# Headers worth replaying from a cached response
+KEPT_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Cache-Control')
+
+_connection = None
+_lock = threading.Lock()
+
+
+def _connect():
+    global _connection
+    if _connection is None:
+        _connection = sqlite3.connect(CACHE_PATH, check_same_thread=False)
+        _connection.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        _connection.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)")
+        _connection.commit()
+    return _connection
+
+
+def auth_scope(session, headers=None, auth=None):
+    """Hash of the credentials a request is sent with"""
+    parts = []
+    merged = dict(session.headers)
+    merged.update(headers or {})
+    for name in ('Authorization', 'X-API-Key'):
+        if merged.get(name):
+            parts.append(f"{name}={merged[name]}")
+
+    auth = auth or session.auth
+    if isinstance(auth, tuple):
+        parts.append(f"user={auth[0]}")
+    elif getattr(auth, 'username', None):
+        parts.append(f"user={auth.username}")
+
+    return hashlib.sha256('\n'.join(parts).encode('utf-8')).hexdigest()[:16]
+
+
+def cache_key(url, scope):
+    return hashlib.sha256(f"{scope} {url}".encode('utf-8')).hexdigest()
+
+
+def lookup(key):
+    """
+    Return the cached entry for key.
+
+    Returns:
+        Dict with 'url', 'headers', 'body' and 'stored_at', or None
+    """
+    with _lock:
+        row = _connect().execute(
+            "SELECT url, headers, body, stored_at FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+    if not row:
+        return None
+    url, headers, body, stored_at = row
+    return {'url': url, 'headers': json.loads(headers), 'body': body, 'stored_at': stored_at}
+
+
+def store(key, response):
+    """Save a 200 response and evict old entries if the cache is over size"""
+    headers = {name: response.headers[name] for name in KEPT_HEADERS if name in response.headers}
+    body = response.content
+    now = time.time()
+
+    with _lock:
+        connection = _connect()
+        connection.execute(
+            "INSERT OR REPLACE INTO responses (key, url, headers, body, size, stored_at, accessed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (key, response.url, json.dumps(headers), body, len(body), now, now)
+        )
+        _evict(connection)
+        connection.commit()
+
+
+def touch(key, refreshed=False):
+    """Mark an entry as used; refreshed=True also restarts its TTL (after a 304)"""
+    now = time.time()
+    with _lock:
+        connection = _connect()
+        if refreshed:
+            connection.execute("UPDATE responses SET accessed_at = ?, stored_at = ? WHERE key = ?", (now, now, key))
+        else:
+            connection.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+        connection.commit()
+
+
+def _evict(connection):
+    total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+    if total <= MAX_BYTES:
+        return
+
+    for key, size in connection.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall():
+        connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+        total -= size
+        if total <= MAX_BYTES:
+            break
+
+
+def conditional_headers(entry):
+    """If-None-Match / If-Modified-Since headers for revalidating an entry"""
+    headers = {}
+    if entry['headers'].get('ETag'):
+        headers['If-None-Match'] = entry['headers']['ETag']
+    if entry['headers'].get('Last-Modified'):
+        headers['If-Modified-Since'] = entry['headers']['Last-Modified']
+    return headers
+
+
+def to_response(entry):
+    """Rebuild a requests.Response from a cached entry"""
+    response = requests.Response()
+    response.status_code = 200
+    response.url = entry['url']
+    response.headers = CaseInsensitiveDict(entry['headers'])
+    response._content = entry['body']
+    response.encoding = get_encoding_from_headers(response.headers)
+    response.from_cache = True
+    return response
+
+
+def clear():
+    """Remove every cached response"""
+    with _lock:
+        connection = _connect()
+        connection.execute("DELETE FROM responses")
+        connection.commit()
@@ -0,0 +1,184 @@
+"""
+Shared HTTP client for Vimeo API, VHX API and OTT page requests.
+
+Keeps one keep-alive requests.Session per host so repeated calls reuse the
+same connection instead of doing a fresh TCP + TLS handshake every time.
+Auth headers and timeouts are attached per host, so callers only pass a URL.
+Requests to the Vimeo and VHX APIs go through the shared rate limiter and are
+retried automatically after a 429. GETs made with cache_ttl are served from
+the on-disk cache in http_cache.py and revalidated once stale.
+"""
+
+import os
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.auth import HTTPBasicAuth
+from dotenv import load_dotenv
+
+import http_cache
+from rate_limit import get_limiter
+
+load_dotenv()
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+VIMEO_ACCEPT = 'application/vnd.vimeo.*+json;version=3.4'
+
+VIMEO_API_HOST = 'api.vimeo.com'
+VHX_API_HOST = 'api.vhx.tv'
+# Largest page size the Vimeo API accepts on list endpoints
+VIMEO_MAX_PER_PAGE = 100
+RATE_LIMITED_HOSTS = (VIMEO_API_HOST, VHX_API_HOST)
+
+# Connections kept open per host; raise this when running many workers
+POOL_SIZE = int(os.getenv('HTTP_POOL_SIZE', '10'))
+DEFAULT_TIMEOUT = float(os.getenv('HTTP_TIMEOUT', '30'))
+# Attempts made for a request that keeps getting 429 responses
+MAX_RETRIES = 3
+
+# Seconds a cached GET is used without asking the server
+CACHE_TTL = int(os.getenv('HTTP_CACHE_TTL', '86400'))
+# Shorter TTL for listings and responses that embed expiring download links
+SHORT_CACHE_TTL = 15 * 60
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def configure(pool_size=None, timeout=None):
+    """
+    Change the pool size and/or default timeout.
+
+    Existing sessions are closed so the next request picks up the new settings.
+    """
+    global POOL_SIZE, DEFAULT_TIMEOUT
+
+    if pool_size is not None:
+        POOL_SIZE = pool_size
+    if timeout is not None:
+        DEFAULT_TIMEOUT = timeout
+    close_all()
+
+
+def vimeo_headers():
+    """Auth headers for api.vimeo.com built from BEARER_TOKEN and VIMEO_API_KEY"""
+    headers = {'Accept': VIMEO_ACCEPT}
+
+    bearer_token = os.getenv('BEARER_TOKEN')
+    api_key = os.getenv('VIMEO_API_KEY')
+    if bearer_token:
+        headers['Authorization'] = 'Bearer ' + bearer_token
+    if api_key:
+        headers['X-API-Key'] = api_key
+    return headers
+
+
+def vhx_auth():
+    """Basic auth for api.vhx.tv (api key as username, empty password)"""
+    api_key = os.getenv('VIMEO_API_KEY')
+    if not api_key:
+        return None
+    return HTTPBasicAuth(api_key, '')
+
+
+def _create_session(host):
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers['User-Agent'] = USER_AGENT
+
+    if host == VIMEO_API_HOST:
+        session.headers.update(vimeo_headers())
+    elif host == VHX_API_HOST:
+        session.auth = vhx_auth()
+
+    return session
+
+
+def get_session(url):
+    """Return the shared session for the host of the given URL"""
+    host = urlparse(url).netloc.lower()
+
+    with _sessions_lock:
+        session = _sessions.get(host)
+        if session is None:
+            session = _create_session(host)
+            _sessions[host] = session
+        return session
+
+
+def request(method, url, **kwargs):
+    """Send a request through the pooled session for the URL's host"""
+    kwargs.setdefault('timeout', DEFAULT_TIMEOUT)
+    session = get_session(url)
+    host = urlparse(url).netloc.lower()
+
+    if host not in RATE_LIMITED_HOSTS:
+        return session.request(method, url, **kwargs)
+
+    limiter = get_limiter(host)
+    for attempt in range(MAX_RETRIES):
+        limiter.acquire()
+        response = session.request(method, url, **kwargs)
+        limiter.update(response)
+
+        if response.status_code != 429 or attempt == MAX_RETRIES - 1:
+            return response
+
+        delay = limiter.backoff(response, attempt)
+        print(f"  Rate limit hit (429), waiting {delay:.0f} seconds before retry...")
+        response.close()
+
+    return response
+
+
+def get(url, cache_ttl=None, **kwargs):
+    """
+    GET through the pooled session for the URL's host.
+
+    With cache_ttl (seconds) the response is served from the on-disk cache
+    while fresh and revalidated with If-None-Match / If-Modified-Since once
+    stale. Streaming requests are never cached.
+    """
+    if cache_ttl is None or kwargs.get('stream'):
+        return request('GET', url, **kwargs)
+
+    session = get_session(url)
+    full_url = requests.Request('GET', url, params=kwargs.pop('params', None)).prepare().url
+    headers = dict(kwargs.pop('headers', None) or {})
+    scope = http_cache.auth_scope(session, headers, kwargs.get('auth'))
+    key = http_cache.cache_key(full_url, scope)
+
+    entry = http_cache.lookup(key)
+    if entry and time.time() - entry['stored_at'] < cache_ttl:
+        http_cache.touch(key)
+        return http_cache.to_response(entry)
+
+    if entry:
+        headers.update(http_cache.conditional_headers(entry))
+
+    response = request('GET', full_url, headers=headers, **kwargs)
+
+    if response.status_code == 304 and entry:
+        http_cache.touch(key, refreshed=True)
+        return http_cache.to_response(entry)
+    if response.status_code == 200:
+        http_cache.store(key, response)
+    return response
+
+
+def patch(url, **kwargs):
+    """PATCH through the pooled session for the URL's host"""
+    return request('PATCH', url, **kwargs)
+
+
+def close_all():
+    """Close every pooled session"""
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
@@ -0,0 +1,98 @@
+"""
+Single-request probe for OTT video pages.
+
+Streams a page just far enough to read its <head> meta tags (og:image,
+og:title, ...) and the "VIDEO_ID" embedded in the page config, then closes
+the connection. Results are memoized per URL so the thumbnail and video
+download paths share one fetch.
+"""
+
+import html
+import re
+import threading
+
+import requests
+import http_client
+
+# Stop reading once this much of a page has been scanned
+MAX_SCAN_BYTES = 512 * 1024
+CHUNK_SIZE = 16 * 1024
+
+META_TAG_RE = re.compile(rb'<meta\s[^>]*>', re.IGNORECASE)
+ATTRIBUTE_RE = re.compile(rb'([\w:-]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\')')
+VIDEO_ID_RE = re.compile(rb'"VIDEO_ID":\s*(\d+)')
+HEAD_END_RE = re.compile(rb'</head\s*>', re.IGNORECASE)
+
+_results = {}
+_results_lock = threading.Lock()
+
+
+def _parse_meta(tag):
+    attributes = {}
+    for match in ATTRIBUTE_RE.finditer(tag):
+        value = match.group(2) if match.group(2) is not None else match.group(3)
+        attributes[match.group(1).lower().decode('ascii', 'ignore')] = html.unescape(value.decode('utf-8', 'replace'))
+
+    key = attributes.get('property') or attributes.get('name')
+    if key and 'content' in attributes:
+        return key.lower(), attributes['content']
+    return None
+
+
+def _scan(response):
+    """Read the page until the head and VIDEO_ID have both been seen"""
+    buffer = b''
+    scanned_to = 0
+    head_done = False
+    meta = {}
+    video_id = None
+
+    for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+        buffer += chunk
+
+        if not head_done:
+            # Back up a little so tags split across chunks are still matched
+            start = max(0, scanned_to - 1024)
+            head_end = HEAD_END_RE.search(buffer, start)
+            stop = head_end.start() if head_end else len(buffer)
+            for tag in META_TAG_RE.findall(buffer, start, stop):
+                parsed = _parse_meta(tag)
+                if parsed:
+                    meta.setdefault(parsed[0], parsed[1])
+            head_done = head_end is not None
+
+        if video_id is None:
+            match = VIDEO_ID_RE.search(buffer, max(0, scanned_to - 64))
+            if match:
+                video_id = match.group(1).decode('ascii')
+
+        scanned_to = len(buffer)
+        if (head_done and video_id) or scanned_to >= MAX_SCAN_BYTES:
+            break
+
+    return {'meta': meta, 'video_id': video_id}
+
+
+def probe_page(page_url):
+    """
+    Fetch an OTT page's meta tags and VIDEO_ID in one streamed request.
+
+    Returns:
+        Dict with 'meta' (name/property -> content) and 'video_id', or None
+        if the page could not be fetched
+    """
+    with _results_lock:
+        if page_url in _results:
+            return _results[page_url]
+
+    try:
+        with http_client.get(page_url, timeout=10, stream=True) as response:
+            response.raise_for_status()
+            result = _scan(response)
+    except requests.exceptions.RequestException as e:
+        print(f"  Error fetching page {page_url}: {e}")
+        return None
+
+    with _results_lock:
+        _results[page_url] = result
+    return result
@@ -0,0 +1,86 @@
+"""
+Concurrent paginator for Vimeo and VHX list endpoints.
+
+The first page is fetched on its own to learn 'total'. Every remaining page
+URL is then known, so those pages are fetched concurrently and their items
+are yielded in page order as soon as each page in sequence is ready.
+"""
+
+import math
+from concurrent.futures import ThreadPoolExecutor
+
+import http_client
+
+PREFETCH_WORKERS = 8
+VHX_PER_PAGE = 150
+
+
+def _fetch_page(url, params, page, cache_ttl):
+    page_params = dict(params)
+    page_params['page'] = page
+    response = http_client.get(url, params=page_params, cache_ttl=cache_ttl)
+
+    if response.status_code != 200:
+        print(f"Error fetching page {page}: {response.status_code} {response.text}")
+        return None
+    return response.json()
+
+
+def iter_items(url, get_items, params=None, per_page=http_client.VIMEO_MAX_PER_PAGE,
+               workers=PREFETCH_WORKERS, cache_ttl=http_client.SHORT_CACHE_TTL, info=None):
+    """
+    Yield every item from a paginated list endpoint, in page order.
+
+    Args:
+        url: List endpoint URL
+        get_items: Function taking a page's JSON and returning its items
+        params: Extra query parameters sent with every page
+        per_page: Page size to request
+        workers: Pages fetched at once after the first
+        cache_ttl: Passed through to http_client.get
+        info: Optional dict that receives the reported 'total'
+
+    Yields:
+        Items from each page; stops early if a page fails
+    """
+    params = dict(params or {})
+    params['per_page'] = per_page
+
+    first = _fetch_page(url, params, 1, cache_ttl)
+    if first is None:
+        return
+
+    total = int(first.get('total') or 0)
+    if info is not None:
+        info['total'] = total
+    page_count = max(1, math.ceil(total / per_page))
+    print(f"Fetching {page_count} pages ({total} items)...")
+
+    yield from get_items(first)
+
+    if page_count == 1:
+        return
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_fetch_page, url, params, page, cache_ttl)
+                   for page in range(2, page_count + 1)]
+
+        for future in futures:
+            data = future.result()
+            if data is None:
+                for remaining in futures:
+                    remaining.cancel()
+                return
+            yield from get_items(data)
+
+
+def iter_vimeo_items(url, fields=None, **kwargs):
+    """Yield items from a Vimeo API list endpoint ('data' array, 'total' count)"""
+    params = {'fields': fields} if fields else {}
+    return iter_items(url, lambda data: data.get('data', []), params=params, **kwargs)
+
+
+def iter_vhx_items(url, embedded_key='videos', per_page=VHX_PER_PAGE, **kwargs):
+    """Yield items from a VHX API list endpoint ('_embedded' collection, 'total' count)"""
+    return iter_items(url, lambda data: data.get('_embedded', {}).get(embedded_key, []),
+                      per_page=per_page, **kwargs)
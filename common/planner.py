@@ -0,0 +1,77 @@
+"""
+Work-remaining planner over the catalog.
+
+Scripts used to walk every sheet row from a hard-coded row_counter up to
+MAX_ROWS, skipping rows that were already done. The planner instead asks the
+catalog for the videos that still need a task (catalog.PENDING, each backed
+by a partial index) and hands only those to a worker, so a re-run costs
+O(pending) rather than O(catalog).
+"""
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import catalog
+
+DEFAULT_WORKERS = 4
+
+
+def plan(connection, tasks=None, source=None):
+    """
+    Count pending work for each task.
+
+    Args:
+        source: Only count videos on this imported workbook (see catalog.pending)
+
+    Returns:
+        Dict of task -> number of videos still pending
+    """
+    counts = {task: catalog.count_pending(connection, task, source) for task in (tasks or catalog.PENDING)}
+    print("Work remaining:")
+    for task, count in counts.items():
+        print(f"  {task}: {count}")
+    return counts
+
+
+def run(connection, task, worker, limit=None, workers=DEFAULT_WORKERS, source=None):
+    """
+    Hand every video pending for a task to a worker.
+
+    The worker is called with the catalog row on a worker thread and returns
+    a dict of catalog fields to store, or None if the video failed. Results
+    are written to the catalog as they arrive, so an interrupted run resumes
+    with only the videos that are still pending.
+
+    Args:
+        connection: Catalog connection
+        task: Key of catalog.PENDING
+        worker: Function taking a catalog row, returning a dict of fields or None
+        limit: Maximum number of videos to hand out
+        workers: Videos processed at once
+        source: Only videos on this imported workbook (see catalog.pending)
+
+    Returns:
+        Tuple of (successful, failed)
+    """
+    rows = catalog.pending(connection, task, limit, source)
+    print(f"\n{len(rows)} videos need {task} ({workers} at a time)...")
+
+    successful = 0
+    failed = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(worker, row): row for row in rows}
+        for future in as_completed(futures):
+            row = futures[future]
+            try:
+                fields = future.result()
+            except Exception as e:
+                print(f"  ✗ {row['video_name']} (ID: {row['vimeo_id']}): {e}")
+                fields = None
+
+            if fields:
+                catalog.upsert(connection, row['vimeo_id'], row['ott_id'], **fields)
+                connection.commit()
+                successful += 1
+            else:
+                failed += 1
+
+    return successful, failed
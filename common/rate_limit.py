@@ -0,0 +1,155 @@
+"""
+Adaptive token-bucket rate limiter for the Vimeo and VHX APIs.
+
+Requests run at MAX_RATE while the API reports plenty of budget left. The
+limiter reads X-RateLimit-Remaining / X-RateLimit-Reset from every response
+and only slows down when the remaining budget drops below LOW_WATERMARK,
+spreading what is left evenly until the window resets. A 429 pauses every
+caller sharing the limiter until Retry-After / X-RateLimit-Reset has passed.
+"""
+
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+# Requests per second while the budget is healthy
+MAX_RATE = float(os.getenv('VIMEO_MAX_RATE', '5'))
+# Requests allowed back-to-back before the rate applies
+BURST = int(os.getenv('VIMEO_BURST', '5'))
+# Start pacing once this many requests are left in the window
+LOW_WATERMARK = int(os.getenv('VIMEO_LOW_WATERMARK', '50'))
+# Fallback wait on 429 when the response has no reset information
+BACKOFF_SECONDS = 30
+MAX_BACKOFF_SECONDS = 900
+
+
+def _seconds_until(value):
+    """
+    Convert a reset header to seconds from now.
+
+    Vimeo sends an ISO 8601 timestamp; Retry-After may be a number of
+    seconds or an HTTP date; some APIs send a unix epoch.
+    """
+    if value is None:
+        return None
+    value = str(value).strip()
+    if not value:
+        return None
+
+    try:
+        number = float(value)
+        # Large numbers are epoch timestamps, small ones are deltas
+        if number > 1e9:
+            return max(0.0, number - time.time())
+        return max(0.0, number)
+    except ValueError:
+        pass
+
+    try:
+        reset_at = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        try:
+            reset_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+
+    if reset_at.tzinfo is None:
+        reset_at = reset_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (reset_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RateLimiter:
+    """Thread-safe token bucket whose rate follows the API's rate-limit headers"""
+
+    def __init__(self, max_rate=MAX_RATE, burst=BURST, low_watermark=LOW_WATERMARK):
+        self.max_rate = max_rate
+        self.rate = max_rate
+        self.burst = burst
+        self.low_watermark = low_watermark
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        """Block until a request may be sent"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    delay = self.blocked_until - now
+                else:
+                    self._refill(now)
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+
+    def update(self, response):
+        """Adjust the rate from a response's X-RateLimit-* headers"""
+        headers = response.headers
+        remaining = headers.get('X-RateLimit-Remaining')
+        if remaining is None:
+            return
+
+        try:
+            remaining = int(remaining)
+        except ValueError:
+            return
+        reset_in = _seconds_until(headers.get('X-RateLimit-Reset'))
+
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+
+            if remaining <= 0:
+                self.tokens = 0.0
+                self.blocked_until = max(self.blocked_until, now + (reset_in or BACKOFF_SECONDS))
+            elif remaining <= self.low_watermark and reset_in:
+                self.rate = min(self.max_rate, remaining / reset_in)
+                self.tokens = min(self.tokens, 1.0)
+            else:
+                self.rate = self.max_rate
+
+    def backoff(self, response=None, attempt=0):
+        """
+        Pause all callers after a 429.
+
+        Returns:
+            Number of seconds callers will wait
+        """
+        delay = None
+        if response is not None:
+            delay = _seconds_until(response.headers.get('Retry-After'))
+            if delay is None:
+                delay = _seconds_until(response.headers.get('X-RateLimit-Reset'))
+        if delay is None:
+            delay = min(MAX_BACKOFF_SECONDS, BACKOFF_SECONDS * (2 ** attempt))
+
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = 0.0
+            self.updated = now
+            self.blocked_until = max(self.blocked_until, now + delay)
+        return delay
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(host):
+    """Return the shared limiter for an API host"""
+    with _limiters_lock:
+        limiter = _limiters.get(host)
+        if limiter is None:
+            limiter = RateLimiter()
+            _limiters[host] = limiter
+        return limiter
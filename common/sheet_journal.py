@@ -0,0 +1,73 @@
+"""
+Append-only write-ahead journal for workbook cell updates.
+
+Every (sheet, row, column, value) update is appended to a JSONL file and
+fsynced before it is applied, so nothing is lost if a script dies between
+workbook saves. The journal is replayed into the workbook in bulk when a
+script starts (crash recovery) and truncated after each successful save.
+"""
+
+import json
+import os
+
+
+def journal_path_for(file_path):
+    """Journal file kept next to the workbook"""
+    return file_path + '.journal.jsonl'
+
+
+class SheetJournal:
+    """JSONL journal of cell updates for one workbook"""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def append(self, sheet_title, row, column, value):
+        """Durably record one cell update"""
+        record = {'sheet': sheet_title, 'row': row, 'column': column, 'value': value}
+        self._file.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def entries(self):
+        """Yield recorded updates in order, ignoring a torn final line"""
+        self._file.flush()
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # Partially written record from a crash mid-append
+                    break
+
+    def replay(self, workbook):
+        """
+        Apply every journaled update to the workbook.
+
+        Returns:
+            Number of updates applied
+        """
+        count = 0
+        for record in self.entries():
+            if record['sheet'] not in workbook.sheetnames:
+                continue
+            sheet = workbook[record['sheet']]
+            sheet.cell(row=record['row'], column=record['column']).value = record['value']
+            count += 1
+        return count
+
+    def checkpoint(self):
+        """Forget all updates; call after the workbook has been saved"""
+        self._file.truncate(0)
+        self._file.seek(0)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self, remove=False):
+        self._file.close()
+        if remove and os.path.exists(self.path):
+            os.remove(self.path)
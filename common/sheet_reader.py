@@ -0,0 +1,54 @@
+"""
+Streaming, read-only access to catalog workbooks.
+
+Loading a workbook with read_only=False builds the full cell DOM, transcripts
+included, before the first row can be looked at. Scan passes only need cell
+values, so these helpers open the file with read_only=True and stream rows
+with iter_rows(values_only=True). Write-backs go through a deferred
+SheetWriter (see sheet_writer.py) that loads the full workbook only when it
+saves.
+"""
+
+import openpyxl
+
+
+def find_sheet_name(file_path, name_contains):
+    """Return the first sheet title containing name_contains (case-insensitive), or None"""
+    workbook = openpyxl.load_workbook(file_path, read_only=True)
+    try:
+        for sheet_name in workbook.sheetnames:
+            if name_contains.lower() in sheet_name.lower():
+                return sheet_name
+        return None
+    finally:
+        workbook.close()
+
+
+def iter_rows(file_path, sheet_name, min_row=2, max_row=None):
+    """
+    Stream rows from a sheet without loading the workbook into memory.
+
+    Args:
+        file_path: Path to the .xlsx file
+        sheet_name: Exact sheet title (see find_sheet_name)
+        min_row: First row to yield (1-based, default skips the header)
+        max_row: Last row to yield, or None for the whole sheet
+
+    Yields:
+        (row_number, values) where values[0] is column 1
+    """
+    workbook = openpyxl.load_workbook(file_path, read_only=True)
+    try:
+        sheet = workbook[sheet_name]
+        rows = sheet.iter_rows(min_row=min_row, max_row=max_row, values_only=True)
+        for row_number, values in enumerate(rows, start=min_row):
+            yield row_number, values
+    finally:
+        workbook.close()
+
+
+def cell_value(values, column):
+    """Value of a 1-based column in a row tuple, None if the row is shorter"""
+    if column <= len(values):
+        return values[column - 1]
+    return None
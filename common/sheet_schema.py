@@ -0,0 +1,135 @@
+"""
+Header-driven column lookup for catalog workbooks.
+
+The catalog workbooks don't agree on column positions (the description is
+column 9 in one and 15 in another), so scripts look columns up by header
+name instead of hard-coding them. The header row of each sheet is read once
+and cached, and rows are decoded into namedtuple records in a single pass
+over each streamed row.
+
+Scripts pass the column each field used to live in as a fallback, so a
+workbook whose headers don't match any alias keeps working as before.
+"""
+
+import os
+from collections import namedtuple
+
+from sheet_reader import iter_rows, cell_value
+
+# Header names accepted for each field, most specific first. Headers are
+# compared lowercased and stripped. A field resolves to an exact match, then
+# the caller's fallback column, and only then to a header containing an alias.
+HEADER_ALIASES = {
+    'category': ('category',),
+    'video_name': ('video name', 'video title', 'title', 'name'),
+    'video_length': ('video length', 'length', 'duration'),
+    'teacher': ('teacher', 'instructor'),
+    'series': ('series',),
+    'language': ('language',),
+    'description': ('description',),
+    'vimeo_link': ('vimeo link', 'vimeo url', 'vimeo id', 'vimeo'),
+    'ott_link': ('video page link', 'ott link', 'vhx link'),
+    'internal_url': ('internal url', 'video link'),
+    'transcript': ('transcript', 'transcripts'),
+    'tags': ('tags', 'tag 1', 'tag'),
+    'status': ('status', 'completed'),
+    'url': ('url', 'link'),
+}
+
+# (path, sheet, header_row, mtime) -> header tuple
+_header_cache = {}
+
+
+def _normalize(header):
+    return str(header).strip().lower() if header is not None else ''
+
+
+def read_headers(file_path, sheet_name, header_row=1):
+    """Header row of a sheet, read once per file version"""
+    key = (os.path.abspath(file_path), sheet_name, header_row, os.path.getmtime(file_path))
+    if key not in _header_cache:
+        headers = ()
+        for _, values in iter_rows(file_path, sheet_name, min_row=header_row, max_row=header_row):
+            headers = tuple(_normalize(value) for value in values)
+        _header_cache[key] = headers
+    return _header_cache[key]
+
+
+def find_column(headers, aliases, partial=False):
+    """
+    1-based column of the first header equal to an alias, or None.
+
+    With partial=True, the first header containing an alias instead.
+    """
+    for alias in aliases:
+        if partial:
+            for index, header in enumerate(headers):
+                if alias in header:
+                    return index + 1
+        elif alias in headers:
+            return headers.index(alias) + 1
+    return None
+
+
+class SheetSchema:
+    """Resolved field -> column mapping for one sheet"""
+
+    def __init__(self, headers, fields):
+        if not isinstance(fields, dict):
+            fields = dict.fromkeys(fields)
+
+        self.columns = {}
+        self.missing = []
+        for field, fallback in fields.items():
+            aliases = HEADER_ALIASES.get(field, (field,))
+            column = find_column(headers, aliases) or fallback
+            if not column:
+                # 'status' would also match 'transcript status', so only as a last resort
+                column = find_column(headers, aliases, partial=True)
+                if column:
+                    print(f"WARNING: '{field}' matched header '{headers[column - 1]}' (column {column}) by substring")
+            if column:
+                self.columns[field] = column
+            else:
+                self.missing.append(field)
+
+        self.fields = tuple(fields)
+        self.Record = namedtuple('Record', ('row_number',) + self.fields)
+
+    def column(self, field):
+        """1-based column for a field; raises KeyError if it could not be resolved"""
+        if field not in self.columns:
+            raise KeyError(f"No column found for '{field}'")
+        return self.columns[field]
+
+    def record(self, row_number, values):
+        """Decode one row tuple into a Record"""
+        return self.Record(row_number, *(cell_value(values, self.columns[field]) if field in self.columns else None
+                                         for field in self.fields))
+
+
+def load_schema(file_path, sheet_name, fields, header_row=1):
+    """
+    Resolve columns for a sheet by header name.
+
+    Args:
+        file_path: Path to the .xlsx file
+        sheet_name: Exact sheet title
+        fields: Field names, or a dict of field name -> fallback column used
+                when no header matches
+        header_row: Row holding the headers
+
+    Returns:
+        SheetSchema
+    """
+    schema = SheetSchema(read_headers(file_path, sheet_name, header_row), fields)
+    print(f"Columns: {', '.join(f'{field}={column}' for field, column in schema.columns.items())}")
+    if schema.missing:
+        print(f"WARNING: No column found for {', '.join(schema.missing)}")
+    return schema
+
+
+def iter_records(file_path, sheet_name, schema, min_row=2, max_row=None):
+    """Stream rows of a sheet as schema Records"""
+    for row_number, values in iter_rows(file_path, sheet_name, min_row=min_row, max_row=max_row):
+        yield schema.record(row_number, values)
@@ -0,0 +1,163 @@
+"""
+Batched, atomic workbook saves.
+
+Scripts used to call wb.save() after every row, rewriting the whole
+workbook each time. SheetWriter applies cell updates to the in-memory
+workbook right away but only saves once FLUSH_EVERY updates are pending or
+FLUSH_SECONDS have passed. Saves go through a temp file and os.replace, so
+a crash mid-save never leaves a truncated workbook. Pending updates are also
+saved at exit and on Ctrl+C / SIGTERM.
+
+With journal=True every update is first written to a SheetJournal, so a
+crash loses nothing: the next SheetWriter for the same workbook replays the
+journal before continuing. Saves then only act as checkpoints and can be
+far less frequent (JOURNAL_FLUSH_EVERY / JOURNAL_FLUSH_SECONDS).
+
+Passing workbook=None gives a deferred writer for scripts that scan the
+sheet with sheet_reader. Updates are only journaled. The full workbook is
+loaded when the writer flushes (on close, at exit or on a signal), the
+journal is replayed into it, and it is saved once. A deferred writer never
+flushes on its own thresholds, because the reader may still have the file
+open.
+"""
+
+import atexit
+import os
+import signal
+import sys
+import tempfile
+import time
+
+import openpyxl
+
+from sheet_journal import SheetJournal, journal_path_for
+
+FLUSH_EVERY = 25
+FLUSH_SECONDS = 60
+JOURNAL_FLUSH_EVERY = 500
+JOURNAL_FLUSH_SECONDS = 15 * 60
+
+
+def save_workbook_atomic(workbook, file_path):
+    """Save workbook to a temp file in the same folder, then swap it into place"""
+    folder = os.path.dirname(os.path.abspath(file_path))
+    temp_fd, temp_path = tempfile.mkstemp(suffix='.xlsx', dir=folder)
+    os.close(temp_fd)
+
+    try:
+        workbook.save(temp_path)
+        os.replace(temp_path, file_path)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+class SheetWriter:
+    """Buffers cell updates to a workbook and saves them in batches"""
+
+    def __init__(self, workbook, file_path, flush_every=None, flush_seconds=None, journal=False):
+        self.workbook = workbook
+        self.deferred = workbook is None
+        journal = journal or self.deferred
+        self.file_path = file_path
+        self.flush_every = flush_every or (JOURNAL_FLUSH_EVERY if journal else FLUSH_EVERY)
+        self.flush_seconds = flush_seconds or (JOURNAL_FLUSH_SECONDS if journal else FLUSH_SECONDS)
+        self.pending = 0
+        self.last_flush = time.monotonic()
+        self._previous_handlers = {}
+
+        self.journal = SheetJournal(journal_path_for(file_path)) if journal else None
+        if self.journal:
+            self._recover()
+
+        atexit.register(self.flush)
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                self._previous_handlers[signum] = signal.signal(signum, self._handle_signal)
+            except (ValueError, OSError):
+                # Not in the main thread, or signal unsupported on this platform
+                pass
+
+    def _recover(self):
+        """Replay updates left in the journal by an interrupted run"""
+        if self.deferred:
+            # Kept in the journal and saved with this run's updates
+            self.pending = sum(1 for _ in self.journal.entries())
+            if self.pending:
+                print(f"  Recovered {self.pending} unsaved updates from {self.journal.path}")
+            return
+
+        recovered = self.journal.replay(self.workbook)
+        if recovered:
+            print(f"  Recovered {recovered} unsaved updates from {self.journal.path}")
+            save_workbook_atomic(self.workbook, self.file_path)
+        self.journal.checkpoint()
+
+    def set(self, sheet, row, column, value):
+        """
+        Update one cell; saves the workbook if a threshold has been reached.
+
+        sheet may be a worksheet or a sheet title.
+        """
+        title = sheet if isinstance(sheet, str) else sheet.title
+        if self.journal:
+            self.journal.append(title, row, column, value)
+        self.pending += 1
+
+        if self.deferred:
+            return
+        self.workbook[title].cell(row=row, column=column).value = value
+
+        if (self.pending >= self.flush_every
+                or time.monotonic() - self.last_flush >= self.flush_seconds):
+            self.flush()
+
+    def flush(self):
+        """Save the workbook if there are pending updates"""
+        if not self.pending:
+            return False
+
+        print(f"  Saving {self.pending} pending updates to {self.file_path}...")
+        if self.deferred:
+            workbook = openpyxl.load_workbook(self.file_path)
+            self.journal.replay(workbook)
+            save_workbook_atomic(workbook, self.file_path)
+        else:
+            save_workbook_atomic(self.workbook, self.file_path)
+        if self.journal:
+            self.journal.checkpoint()
+        self.pending = 0
+        self.last_flush = time.monotonic()
+        return True
+
+    def close(self):
+        """Flush and stop listening for exit / signals"""
+        self.flush()
+        atexit.unregister(self.flush)
+        for signum, handler in self._previous_handlers.items():
+            signal.signal(signum, handler)
+        self._previous_handlers = {}
+
+        if self.journal:
+            self.journal.close(remove=True)
+            self.journal = None
+
+    def _handle_signal(self, signum, frame):
+        try:
+            self.flush()
+        finally:
+            previous = self._previous_handlers.get(signum)
+            if callable(previous):
+                previous(signum, frame)
+            elif signum == signal.SIGINT:
+                raise KeyboardInterrupt
+            else:
+                sys.exit(128 + signum)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
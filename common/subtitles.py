@@ -0,0 +1,162 @@
+"""
+Streaming parser for WebVTT and SRT subtitles.
+
+iter_cues reads a subtitle file (or string) line by line and yields one Cue
+per caption, keeping its timing, so transcripts, spelling conversion
+and subtitle checks can all work from the same parse. Times are integer
+milliseconds. Cue text is kept as written (including <v Name> style tags);
+plain_text strips the markup.
+"""
+
+import io
+import re
+from collections import namedtuple
+
+# identifier: cue number / VTT cue id, or None
+# start, end: milliseconds
+# text: caption lines joined with '\n', markup kept
+# settings: VTT cue settings after the end time ('align:start ...'), '' for SRT
+# line: 1-based line number of the first text line, for edits in place
+Cue = namedtuple('Cue', ['identifier', 'start', 'end', 'text', 'settings', 'line'])
+
+TIMING_RE = re.compile(
+    r'^\s*(?:(\d+):)?(\d{1,2}):(\d{2})[.,](\d{1,3})\s*-->\s*'
+    r'(?:(\d+):)?(\d{1,2}):(\d{2})[.,](\d{1,3})(.*)$'
+)
+TAG_RE = re.compile(r'<[^>]+>')
+# VTT blocks that are not cues
+NON_CUE_BLOCKS = ('NOTE', 'STYLE', 'REGION')
+
+
+def _milliseconds(hours, minutes, seconds, fraction):
+    return ((int(hours or 0) * 60 + int(minutes)) * 60 + int(seconds)) * 1000 + int(fraction.ljust(3, '0'))
+
+
+def format_timestamp(milliseconds, separator='.'):
+    """HH:MM:SS.mmm (VTT) or HH:MM:SS,mmm with separator=',' (SRT)"""
+    seconds, millis = divmod(milliseconds, 1000)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}{separator}{millis:03d}"
+
+
+def _lines(source):
+    if isinstance(source, bytes):
+        raise TypeError("Subtitle content must be a string, not bytes. Decode bytes before parsing.")
+    if isinstance(source, str):
+        return io.StringIO(source)
+    return source
+
+
+def _cues_from_block(block, first_line):
+    """
+    Cues in the lines of one blank-line separated block.
+
+    A block normally holds one cue, but files that leave out the blank line
+    between cues put several in one block, so every timing line starts a new
+    cue. The line before a timing line is its identifier when it opens the
+    block, or when it is a bare cue number (SRT).
+    """
+    timings = [index for index, line in enumerate(block) if TIMING_RE.match(line)]
+    identifiers = []
+    for n, index in enumerate(timings):
+        if n == 0:
+            has_identifier = index == 1 and not block[0].startswith(NON_CUE_BLOCKS + ('WEBVTT',))
+        else:
+            has_identifier = index - 1 > timings[n - 1] and block[index - 1].strip().isdigit()
+        identifiers.append(index - 1 if has_identifier else None)
+
+    for n, index in enumerate(timings):
+        if n + 1 < len(timings):
+            text_end = identifiers[n + 1] if identifiers[n + 1] is not None else timings[n + 1]
+        else:
+            text_end = len(block)
+        identifier = block[identifiers[n]].strip() if identifiers[n] is not None else None
+
+        match = TIMING_RE.match(block[index])
+        start = _milliseconds(*match.group(1, 2, 3, 4))
+        end = _milliseconds(*match.group(5, 6, 7, 8))
+        yield Cue(identifier, start, end, '\n'.join(block[index + 1:text_end]), match.group(9).strip(),
+                  first_line + index + 1)
+
+
+def iter_cues(source):
+    """
+    Yield the cues of a WebVTT or SRT document.
+
+    Args:
+        source: Subtitle text, or any iterable of lines such as an open file
+
+    Yields:
+        Cue records in file order
+    """
+    block = []
+    first_line = 1
+    for line_number, line in enumerate(_lines(source), start=1):
+        line = line.rstrip('\r\n').lstrip('﻿')
+        if line.strip():
+            if not block:
+                first_line = line_number
+            block.append(line)
+            continue
+        if block:
+            yield from _cues_from_block(block, first_line)
+            block = []
+
+    if block:
+        yield from _cues_from_block(block, first_line)
+
+
+def plain_text(text):
+    """Caption text without markup, one line per caption line"""
+    lines = (TAG_RE.sub('', line).strip() for line in text.split('\n'))
+    return '\n'.join(line for line in lines if line)
+
+
+def parse_vtt_to_text(vtt_content):
+    """
+    Parse VTT (or SRT) content and extract plain text transcript.
+
+    Args:
+        vtt_content: String content of VTT file (not bytes), or an open file
+
+    Returns:
+        String of clean transcript text
+    """
+    words = []
+    for cue in iter_cues(vtt_content):
+        text = plain_text(cue.text)
+        if text:
+            words.append(text.replace('\n', ' '))
+    return ' '.join(words)
+
+
+def format_cues(cues, fmt='vtt'):
+    """
+    Serialize cues back to a WebVTT or SRT document.
+
+    Args:
+        cues: Iterable of Cue records
+        fmt: 'vtt' or 'srt'
+
+    Returns:
+        Document text
+    """
+    separator = ',' if fmt == 'srt' else '.'
+    blocks = ['WEBVTT'] if fmt == 'vtt' else []
+
+    for number, cue in enumerate(cues, start=1):
+        lines = []
+        if fmt == 'srt':
+            lines.append(str(number))
+        elif cue.identifier:
+            lines.append(cue.identifier)
+
+        timing = f"{format_timestamp(cue.start, separator)} --> {format_timestamp(cue.end, separator)}"
+        if cue.settings and fmt == 'vtt':
+            timing += ' ' + cue.settings
+        lines.append(timing)
+        lines.append(cue.text)
+        blocks.append('\n'.join(lines))
+
+    return '\n\n'.join(blocks) + '\n'
@@ -0,0 +1,189 @@
+"""
+Batch VTT -> TXT conversion over a process pool.
+
+The folder is listed once with os.scandir, and that listing also tells us
+which .txt transcripts already exist, so no file is stat'ed twice. A manifest
+(MANIFEST_NAME, kept in the folder) records the mtime, size and SHA-1 of each
+converted VTT. Files whose mtime and size are unchanged are skipped without
+being opened. Files that were touched but whose content hash is unchanged are
+only re-recorded. Everything else is parsed with subtitles.parse_vtt_to_text
+on a process pool, in chunks so tens of thousands of small files do not each
+pay a round trip to a worker.
+"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from subtitles import parse_vtt_to_text
+
+MANIFEST_NAME = '.vtt_manifest.json'
+DEFAULT_WORKERS = os.cpu_count() or 1
+# Below this many files a pool costs more to start than it saves
+POOL_THRESHOLD = 64
+
+
+def load_manifest(folder):
+    """Manifest entries by VTT file name, or {} if there is none yet"""
+    try:
+        with open(Path(folder) / MANIFEST_NAME, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(folder, manifest):
+    """Write the manifest atomically"""
+    path = Path(folder) / MANIFEST_NAME
+    temp_path = path.with_name(path.name + '.tmp')
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(temp_path, path)
+
+
+def scan_folder(folder):
+    """
+    List the folder once.
+
+    Returns:
+        Tuple of (vtts, txt_names): vtts maps each .vtt name to (mtime_ns, size),
+        txt_names is the set of .txt file names present
+    """
+    vtts = {}
+    txt_names = set()
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            if not entry.is_file():
+                continue
+            name = entry.name
+            if name.endswith('.vtt'):
+                stat = entry.stat()
+                vtts[name] = (stat.st_mtime_ns, stat.st_size)
+            elif name.endswith('.txt'):
+                txt_names.add(name)
+    return vtts, txt_names
+
+
+def seed_manifest(folder, vtts, txt_names):
+    """Manifest entries for every VTT that already has a .txt transcript"""
+    manifest = {}
+    for name, (mtime_ns, size) in vtts.items():
+        if name[:-len('.vtt')] + '.txt' in txt_names:
+            with open(Path(folder) / name, 'rb') as f:
+                sha1 = hashlib.sha1(f.read()).hexdigest()
+            manifest[name] = {'mtime_ns': mtime_ns, 'size': size, 'sha1': sha1}
+    if manifest:
+        print(f"No manifest yet; keeping {len(manifest)} existing transcripts as they are")
+    return manifest
+
+
+def convert_file(job):
+    """
+    Convert one VTT file (runs in a worker process).
+
+    Args:
+        job: Tuple of (vtt_path, txt_path, previous_hash, txt_exists)
+
+    Returns:
+        Tuple of (status, sha1, error) where status is 'converted',
+        'unchanged' or 'failed'
+    """
+    vtt_path, txt_path, previous_hash, txt_exists = job
+    try:
+        with open(vtt_path, 'rb') as f:
+            data = f.read()
+        sha1 = hashlib.sha1(data).hexdigest()
+        if sha1 == previous_hash and txt_exists:
+            return 'unchanged', sha1, None
+
+        transcript_text = parse_vtt_to_text(data.decode('utf-8-sig'))
+
+        temp_path = txt_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(transcript_text)
+        os.replace(temp_path, txt_path)
+        return 'converted', sha1, None
+    except Exception as e:
+        return 'failed', None, str(e)
+
+
+def convert_folder(folder, workers=DEFAULT_WORKERS):
+    """
+    Convert every new or changed VTT in a folder to a .txt transcript.
+
+    Args:
+        folder: Folder containing VTT files; transcripts are written next to them
+        workers: Worker processes
+
+    Returns:
+        Tuple of (converted, failed, skipped)
+    """
+    folder = Path(folder)
+    if not folder.exists():
+        print(f"Error: Transcripts folder not found: {folder}")
+        return (0, 0, 0)
+
+    vtts, txt_names = scan_folder(folder)
+    if not vtts:
+        print("No VTT files found in transcripts folder")
+        return (0, 0, 0)
+
+    manifest = load_manifest(folder)
+    if not manifest and not (folder / MANIFEST_NAME).exists():
+        # First run: transcripts that already exist may have been edited by
+        # hand, so they are recorded as they are rather than regenerated
+        manifest = seed_manifest(folder, vtts, txt_names)
+    # Forget files that are gone
+    manifest = {name: entry for name, entry in manifest.items() if name in vtts}
+
+    names = []
+    jobs = []
+    skipped = 0
+    for name, (mtime_ns, size) in vtts.items():
+        txt_name = name[:-len('.vtt')] + '.txt'
+        entry = manifest.get(name)
+        txt_exists = txt_name in txt_names
+        if entry and txt_exists and entry['mtime_ns'] == mtime_ns and entry['size'] == size:
+            skipped += 1
+            continue
+        names.append(name)
+        jobs.append((str(folder / name), str(folder / txt_name), entry['sha1'] if entry else None, txt_exists))
+
+    print(f"Found {len(vtts)} VTT files, {len(jobs)} new or changed\n")
+
+    converted = 0
+    failed = 0
+    pool = None
+    try:
+        if len(jobs) < POOL_THRESHOLD or workers <= 1:
+            results = map(convert_file, jobs)
+        else:
+            pool = ProcessPoolExecutor(max_workers=workers)
+            chunksize = max(1, len(jobs) // (workers * 4))
+            results = pool.map(convert_file, jobs, chunksize=chunksize)
+
+        for name, (status, sha1, error) in zip(names, results):
+            if status == 'failed':
+                print(f"  Error converting {name}: {error}")
+                failed += 1
+                continue
+            if status == 'converted':
+                converted += 1
+            else:
+                skipped += 1
+            mtime_ns, size = vtts[name]
+            manifest[name] = {'mtime_ns': mtime_ns, 'size': size, 'sha1': sha1}
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        # Keep what finished even if the run was interrupted
+        save_manifest(folder, manifest)
+
+    print(f"\n{'='*50}")
+    print("Conversion complete!")
+    print(f"Successfully converted: {converted}")
+    print(f"Failed: {failed}")
+    print(f"Skipped: {skipped}")
+    return (converted, failed, skipped)
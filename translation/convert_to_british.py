@@ -0,0 +1,19 @@
+"""
+Convert the English subtitle files to British spelling.
+
+Python counterpart of convert_to_british.js: reads files/English-vtt-files/*_en.vtt,
+writes files/British-vtt-files/*_uk.vtt and records every change in
+files/conversion_log.json in the same format. The dictionary is compiled once
+(see spelling.py) instead of once per word per line, and only new or changed
+files are converted (see subtitle_variants.py).
+"""
+
+from subtitle_variants import TRANSFORMS, run
+
+
+def main():
+    run([transform for transform in TRANSFORMS if transform.name == 'british'])
+
+
+if __name__ == "__main__":
+    main()
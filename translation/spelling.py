@@ -0,0 +1,110 @@
+"""
+Dictionary-based spelling conversion for subtitles.
+
+A spelling dictionary (american_spellings.json, british_spellings.json) is
+compiled once into a single regex: the keys are folded into a character trie,
+so the pattern branches on one letter at a time instead of trying every word
+at every position. Each subtitle line is then converted in one pass. Matches
+are whole words and case-insensitive. The replacement keeps the case of the
+original (lower, UPPER or Title), following the rules of
+convert_to_british.js.
+"""
+
+import json
+import re
+
+import common_path  # puts ../common on sys.path
+from subtitles import iter_cues
+
+
+def _trie_pattern(words):
+    """Regex source matching any of words, built from a character trie"""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # A word may end here; the group is greedy, so longer words win
+        return '(?:' + body + ')?' if '' in node else body
+
+    return build(trie)
+
+
+def match_case(original, source, target):
+    """
+    Case target the way original is cased.
+
+    Args:
+        original: Text as it appears in the subtitle
+        source: Dictionary key that matched it
+        target: Dictionary value to put in its place
+    """
+    if original == source:
+        return target
+    if original == source.upper():
+        return target.upper()
+    if original[0].isupper():
+        return target[0].upper() + target[1:]
+    return target
+
+
+class SpellingConverter:
+    """Converts text with one spelling dictionary"""
+
+    def __init__(self, spellings):
+        # Keys are matched case-insensitively; keep each key's own casing for match_case
+        self.spellings = {source.lower(): (source, target) for source, target in spellings.items()}
+        self.pattern = re.compile(r'\b' + _trie_pattern(self.spellings) + r'\b', re.IGNORECASE)
+
+    def convert_line(self, text, line_number):
+        """
+        Convert one line of text.
+
+        Returns:
+            Tuple of (converted_text, changes) where changes are
+            {'line', 'original', 'changed'} records
+        """
+        changes = []
+
+        def replace(match):
+            original = match.group(0)
+            source, target = self.spellings[original.lower()]
+            replacement = match_case(original, source, target)
+            if replacement != original:
+                changes.append({'line': line_number, 'original': original, 'changed': replacement})
+            return replacement
+
+        return self.pattern.sub(replace, text), changes
+
+    def convert_subtitle(self, content):
+        """
+        Convert the caption text of a VTT or SRT document.
+
+        Only cue text lines are touched; headers, timings, cue numbers and
+        notes are kept byte for byte.
+
+        Returns:
+            Tuple of (converted_content, changes)
+        """
+        lines = content.split('\n')
+        changes = []
+        for cue in iter_cues(content):
+            if not cue.text:
+                continue
+            for index in range(cue.line - 1, cue.line - 1 + cue.text.count('\n') + 1):
+                lines[index], line_changes = self.convert_line(lines[index], index + 1)
+                changes.extend(line_changes)
+        return '\n'.join(lines), changes
+
+
+def load_converter(path):
+    """SpellingConverter for a JSON dictionary file of source -> target spellings"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return SpellingConverter(json.load(f))
@@ -0,0 +1,197 @@
+"""
+Subtitle CDN manifest generator.
+
+The subtitle output tree is walked once with os.scandir into an index of
+video ID -> language code -> file, where each file is keyed by its path
+relative to the tree (the same path it has under SUBTITLE_URL), so files
+with the same name in different folders stay apart. The index is written
+as JSON (MANIFEST_JSON) and as a flat CSV (MANIFEST_CSV).
+
+The upload list (UPLOAD_CSV) is the difference between the index and the
+last manifest known to be on the CDN (UPLOADED_JSON). That baseline only
+moves forward when an upload is confirmed with --confirm, so running the
+generator again before uploading keeps every pending change on the list.
+
+Files are compared by SHA-1. A file whose size and mtime match the previous
+manifest keeps its recorded hash without being read, so a re-run only reads
+files that were touched.
+
+Usage:
+    python subtitle_cdn.py [subtitle_dir]   # rebuild manifest and upload list
+    python subtitle_cdn.py --confirm        # after uploading UPLOAD_CSV
+"""
+
+import csv
+import hashlib
+import io
+import json
+import os
+import shutil
+import sys
+
+from subtitle_sheet import FILENAME_RE, SUBTITLE_DIR, SUBTITLE_URL, build_language_table, resolve_language
+from subtitle_variants import load_json, write_atomic
+
+MANIFEST_JSON = 'files/subtitle_manifest.json'
+MANIFEST_CSV = 'files/subtitle_manifest.csv'
+UPLOAD_CSV = 'files/subtitle_upload.csv'
+UPLOADED_JSON = 'files/subtitle_uploaded.json'
+
+CSV_FIELDS = ['video_id', 'language_code', 'language', 'format', 'url', 'file', 'size', 'sha1']
+UPLOAD_FIELDS = ['change'] + CSV_FIELDS
+
+
+def iter_entries(index):
+    """(video_id, lang_code, path, entry) for every file in an index, in sorted order"""
+    for video_id in sorted(index):
+        for lang_code in sorted(index[video_id]):
+            for path, entry in sorted(index[video_id][lang_code].items()):
+                yield video_id, lang_code, path, entry
+
+
+def files_by_path(index):
+    """Relative path -> (video_id, lang_code, path, entry)"""
+    return {item[2]: item for item in iter_entries(index)}
+
+
+def scan_subtitles(root, previous=None):
+    """
+    Index every subtitle file under root in one pass.
+
+    Args:
+        root: Subtitle output tree
+        previous: Earlier index, whose hashes are reused for untouched files
+
+    Returns:
+        Dict of video_id -> language code -> relative path -> entry dict
+        (format, url, size, mtime_ns, sha1)
+    """
+    previous = files_by_path(previous or {})
+    index = {}
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    stack.append(entry.path)
+                    continue
+                match = FILENAME_RE.fullmatch(entry.name)
+                if not match:
+                    continue
+
+                video_id, lang_code, file_ext = match.groups()
+                path = os.path.relpath(entry.path, root).replace(os.sep, '/')
+                stat = entry.stat()
+                old = previous.get(path, (None, None, None, None))[3]
+                if old and old['size'] == stat.st_size and old['mtime_ns'] == stat.st_mtime_ns:
+                    sha1 = old['sha1']
+                else:
+                    with open(entry.path, 'rb') as f:
+                        sha1 = hashlib.sha1(f.read()).hexdigest()
+
+                index.setdefault(video_id, {}).setdefault(lang_code, {})[path] = {
+                    'format': file_ext,
+                    'url': f"{SUBTITLE_URL}{path}",
+                    'size': stat.st_size,
+                    'mtime_ns': stat.st_mtime_ns,
+                    'sha1': sha1,
+                }
+    return index
+
+
+def diff_manifests(previous, index):
+    """
+    Compare two indexes.
+
+    Returns:
+        Tuple of (changes, removed): changes is a list of ('new' | 'changed',
+        video_id, lang_code, path, entry); removed lists entries of
+        previous that are gone
+    """
+    old_files = files_by_path(previous)
+    new_files = files_by_path(index)
+
+    changes = []
+    for path, item in new_files.items():
+        old = old_files.get(path)
+        if old is None:
+            changes.append(('new',) + item)
+        elif old[3]['sha1'] != item[3]['sha1']:
+            changes.append(('changed',) + item)
+
+    removed = [('removed',) + item for path, item in old_files.items() if path not in new_files]
+    return changes, removed
+
+
+def _csv_row(table, video_id, lang_code, path, entry):
+    return {
+        'video_id': video_id,
+        'language_code': lang_code,
+        'language': resolve_language(table, lang_code),
+        'format': entry['format'],
+        'url': entry['url'],
+        'file': path,
+        'size': entry['size'],
+        'sha1': entry['sha1'],
+    }
+
+
+def _csv_text(fields, rows):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields)
+    writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue()
+
+
+def generate(root=SUBTITLE_DIR, table=None):
+    """
+    Rebuild the manifest for root and list everything not yet on the CDN.
+
+    Returns:
+        Tuple of (files, changes, removed)
+    """
+    if not os.path.isdir(root):
+        print(f"Error: Subtitle folder not found: {root}")
+        return (0, [], [])
+    table = table if table is not None else build_language_table()
+
+    index = scan_subtitles(root, load_json(MANIFEST_JSON))
+    changes, removed = diff_manifests(load_json(UPLOADED_JSON), index)
+
+    upload_rows = [dict(_csv_row(table, *change[1:]), change=change[0]) for change in changes + removed]
+    write_atomic(UPLOAD_CSV, _csv_text(UPLOAD_FIELDS, upload_rows))
+    write_atomic(MANIFEST_CSV, _csv_text(CSV_FIELDS, (_csv_row(table, *item) for item in iter_entries(index))))
+    write_atomic(MANIFEST_JSON, json.dumps(index, indent=1, sort_keys=True))
+
+    files = sum(1 for _ in iter_entries(index))
+    new = sum(1 for change in changes if change[0] == 'new')
+    print(f"Indexed {files} subtitle files for {len(index)} videos under {root}")
+    print(f"Pending upload - new: {new}, changed: {len(changes) - new}, removed: {len(removed)}")
+    print(f"Manifest: {MANIFEST_JSON}, {MANIFEST_CSV}")
+    print(f"Upload list: {UPLOAD_CSV} (run with --confirm once it is uploaded)")
+    return files, changes, removed
+
+
+def confirm_upload():
+    """Record the current manifest as uploaded, so the next upload list starts from it"""
+    if not os.path.exists(MANIFEST_JSON):
+        print(f"Error: No manifest to confirm: {MANIFEST_JSON}")
+        return False
+    temp_path = UPLOADED_JSON + '.tmp'
+    shutil.copyfile(MANIFEST_JSON, temp_path)
+    os.replace(temp_path, UPLOADED_JSON)
+    print(f"Confirmed upload: {UPLOADED_JSON} now matches {MANIFEST_JSON}")
+    return True
+
+
+def main():
+    args = sys.argv[1:]
+    if args == ['--confirm']:
+        confirm_upload()
+    else:
+        generate(args[0] if args else SUBTITLE_DIR)
+
+
+if __name__ == "__main__":
+    main()
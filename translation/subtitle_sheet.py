@@ -1,75 +1,153 @@
+"""
+Build the subtitle manifest (Subtitle_updated.csv).
+
+Rows of files/Subtitle.csv are streamed straight to the output. Rows that
+only carry a file name like "1129940028_bn.vtt" get their video ID,
+language name and CDN link filled in. Then every subtitle file in
+SUBTITLE_DIR that the CSV did not list is added from the directory listing.
+Rows are never held in memory; only the file names already written are
+remembered, so nothing is listed twice.
+
+Language codes are resolved through a table built once from
+files/languages.txt ("Bengali (bn)" per line). Lookups are BCP-47 aware.
+Case and '_' vs '-' do not matter, private-use suffixes are dropped
+(en-x-autogen -> en), and region/script subtags fall back to the base
+language (pt-BR -> pt when only pt is listed).
+"""
+
 import csv
+import os
 import re
 
-# First, let's create a language mapping dictionary from the languages.txt file
-lang_mapping = {}
-with open('files/languages.txt', 'r', encoding='utf-8') as f:
-    for line in f:
-        line = line.strip()
-        if line and '(' in line and ')' in line:
-            # Extract language name and code
-            match = re.match(r'(.+?)\s*\(([^)]+)\)$', line)
-            if match:
-                lang_name = match.group(1).strip()
-                lang_code = match.group(2).strip()
-                lang_mapping[lang_code] = lang_name
-
-# print(lang_mapping)
-
-print(f"Loaded {len(lang_mapping)} language mappings")
-print("Sample mappings:", list(lang_mapping.items())[:5])
-
-# Now process the CSV
-rows = []
-with open('files/Subtitle.csv', 'r', encoding='utf-8') as f:
-    reader = csv.reader(f)
-    header = next(reader)
-    rows.append(header)
-    
-    for i, row in enumerate(reader, start=2):  # start=2 because we skipped header (line 1)
-        if i <= 149:
-            # Keep rows 1-149 as they are
-            rows.append(row)
+LANGUAGES_FILE = 'files/languages.txt'
+SUBTITLE_CSV = 'files/Subtitle.csv'
+SUBTITLE_DIR = 'files/subtitles'
+OUTPUT_CSV = 'files/Subtitle_updated.csv'
+
+SUBTITLE_URL = 'https://articles.caravanwellness.com/content/subtitles/'
+DEFAULT_HEADER = ['Video ID', 'Language', 'Link']
+
+# "1129940028_bn.vtt", "1129940028_en-x-autogen.srt"
+FILENAME_RE = re.compile(r'(\d+)_([^.]+)\.(vtt|srt)')
+
+
+def normalize_code(code):
+    return code.strip().replace('_', '-').lower()
+
+
+def build_language_table(path=LANGUAGES_FILE):
+    """
+    Map normalized language codes to names from languages.txt.
+
+    Returns:
+        Dict of code -> language name
+    """
+    table = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line.endswith(')') or '(' not in line:
+                continue
+            name, _, code = line[:-1].rpartition('(')
+            table[normalize_code(code)] = name.strip()
+    return table
+
+
+def resolve_language(table, code):
+    """
+    Language name for a BCP-47 code, or the code itself if it is unknown.
+
+    Tries the full code, then without its private-use part (-x-...), then
+    drops subtags from the end until one is in the table. Results are
+    stored back in the table, so each distinct code is resolved only once.
+    """
+    key = normalize_code(code)
+    if key in table:
+        return table[key]
+
+    candidate = key.split('-x-', 1)[0]
+    name = code
+    while candidate:
+        if candidate in table:
+            name = table[candidate]
+            break
+        candidate = candidate.rpartition('-')[0]
+
+    table[key] = name
+    return name
+
+
+def subtitle_row(file_name, table):
+    """[video_id, language name, link] for a subtitle file name, or None if it doesn't match"""
+    match = FILENAME_RE.match(file_name)
+    if not match:
+        return None
+    video_id, lang_code, file_ext = match.groups()
+    return [video_id, resolve_language(table, lang_code),
+            f"{SUBTITLE_URL}{video_id}_{lang_code}.{file_ext}"]
+
+
+def link_file_name(link):
+    """File name at the end of a link or path"""
+    return link.rsplit('/', 1)[-1]
+
+
+def build_manifest(table, csv_path=SUBTITLE_CSV, subtitle_dir=SUBTITLE_DIR, output_path=OUTPUT_CSV):
+    """
+    Write the manifest in one streaming pass.
+
+    Returns:
+        Tuple of (rows_written, rows_filled, files_added)
+    """
+    written = 0
+    filled = 0
+    added = 0
+    seen = set()
+
+    with open(output_path, 'w', newline='', encoding='utf-8') as out:
+        writer = csv.writer(out)
+
+        if os.path.exists(csv_path):
+            with open(csv_path, 'r', newline='', encoding='utf-8') as f:
+                reader = csv.reader(f)
+                writer.writerow(next(reader, DEFAULT_HEADER))
+                for row in reader:
+                    video_id, language, link = (row + ['', '', ''])[:3]
+                    if not video_id and not language and link:
+                        new_row = subtitle_row(link, table)
+                        if new_row:
+                            row = new_row
+                            filled += 1
+                    if link:
+                        seen.add(link_file_name(link))
+                    writer.writerow(row)
+                    written += 1
         else:
-            # Process rows after 149
-            video_id = row[0]
-            language = row[1]
-            link = row[2]
-            
-            # Extract video_id and language code from the filename
-            if not video_id and not language and link:
-                # Parse filename like "1129940028_bn.vtt" or "1129940028_bn.srt"
-                filename = link
-                match = re.match(r'(\d+)_([^.]+)\.(vtt|srt)', filename)
-                if match:
-                    extracted_video_id = match.group(1)
-                    lang_code = match.group(2)
-                    file_ext = match.group(3)
-
-                    # Map language code to full language name
-                    language_name = lang_mapping.get(lang_code, lang_code)
-
-                    # Create new link with URL prefix
-                    new_link = f"https://articles.caravanwellness.com/content/subtitles/{extracted_video_id}_{lang_code}.{file_ext}"
-                    
-                    rows.append([extracted_video_id, language_name, new_link])
-                else:
-                    # If pattern doesn't match, keep as is
-                    rows.append(row)
-            else:
-                # If already has data, keep as is
-                rows.append(row)
-
-print(f"Processed {len(rows)} total rows")
-
-# Write to output file
-with open('files/Subtitle_updated.csv', 'w', newline='', encoding='utf-8') as f:
-    writer = csv.writer(f)
-    writer.writerows(rows)
-
-print("CSV file updated successfully!")
-
-# Show a sample of the updated rows
-print("\nSample of updated rows (rows 148-155):")
-for i in range(148, min(155, len(rows))):
-    print(f"Row {i}: {rows[i]}")
\ No newline at end of file
+            writer.writerow(DEFAULT_HEADER)
+
+        if os.path.isdir(subtitle_dir):
+            with os.scandir(subtitle_dir) as entries:
+                for entry in entries:
+                    if entry.name in seen or not entry.is_file():
+                        continue
+                    row = subtitle_row(entry.name, table)
+                    if row:
+                        writer.writerow(row)
+                        written += 1
+                        added += 1
+
+    return written, filled, added
+
+
+def main():
+    table = build_language_table()
+    print(f"Loaded {len(table)} language mappings")
+    print("Sample mappings:", list(table.items())[:5])
+
+    written, filled, added = build_manifest(table)
+    print(f"Processed {written} total rows ({filled} filled in, {added} added from {SUBTITLE_DIR})")
+    print(f"CSV file updated successfully: {OUTPUT_CSV}")
+
+
+if __name__ == "__main__":
+    main()
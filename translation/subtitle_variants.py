@@ -0,0 +1,241 @@
+"""
+Regional subtitle variants from dictionary-based spelling transforms.
+
+Every *_en.vtt / *_en.srt under INPUT_DIR (searched recursively) is run
+through each transform in TRANSFORMS. Each transform writes its own copy
+under its output folder, mirroring the input tree, with the language tag
+in the file name swapped (video_en.vtt -> video_uk.vtt).
+
+A manifest (MANIFEST_FILE) remembers the mtime, size and SHA-1 of each input
+and, per transform, the hash of the dictionary its output was made with. An
+output is rebuilt only when its input content, its dictionary or the output
+file itself has changed. Files are converted on a process pool. Each worker
+compiles the dictionaries once, when it starts. Outputs, change logs and the
+manifest are all written atomically.
+"""
+
+import hashlib
+import json
+import os
+import sys
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from spelling import load_converter
+
+BASE_DIR = Path(__file__).parent
+INPUT_DIR = BASE_DIR / 'files' / 'English-vtt-files'
+MANIFEST_FILE = BASE_DIR / 'files' / '.variants_manifest.json'
+
+INPUT_SUFFIXES = ('_en.vtt', '_en.srt')
+
+# language: tag that replaces 'en' in output file names
+# log_file: change log in the conversion_log.json format of convert_to_british.js
+Transform = namedtuple('Transform', ['name', 'dictionary', 'output_dir', 'language', 'log_file'])
+
+TRANSFORMS = [
+    Transform('british', BASE_DIR / 'american_spellings.json', BASE_DIR / 'files' / 'British-vtt-files',
+              'uk', BASE_DIR / 'files' / 'conversion_log.json'),
+    Transform('american', BASE_DIR / 'british_spellings.json', BASE_DIR / 'files' / 'American-vtt-files',
+              'us', BASE_DIR / 'files' / 'conversion_log_us.json'),
+]
+
+DEFAULT_WORKERS = os.cpu_count() or 1
+# Below this many files a pool costs more to start than it saves
+POOL_THRESHOLD = 32
+
+# Compiled converters of the current process, by transform name
+_converters = {}
+
+
+def file_hash(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def write_atomic(path, text):
+    """Write text to path through a temporary file, so readers never see half a file"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(path.name + '.tmp')
+    with open(temp_path, 'w', encoding='utf-8', newline='') as f:
+        f.write(text)
+    os.replace(temp_path, path)
+
+
+def load_json(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def output_name(file_name, language):
+    """video_en.vtt -> video_<language>.vtt"""
+    stem, extension = file_name.rsplit('_en.', 1)
+    return f"{stem}_{language}.{extension}"
+
+
+def scan_inputs(input_dir):
+    """Relative posix path -> (mtime_ns, size) of every input subtitle under input_dir"""
+    inputs = {}
+    for root, dirs, files in os.walk(input_dir):
+        for file_name in files:
+            if file_name.endswith(INPUT_SUFFIXES):
+                path = os.path.join(root, file_name)
+                stat = os.stat(path)
+                inputs[Path(path).relative_to(input_dir).as_posix()] = (stat.st_mtime_ns, stat.st_size)
+    return inputs
+
+
+def _init_worker(dictionaries):
+    """Compile each transform's dictionary once per process"""
+    for name, path in dictionaries:
+        _converters[name] = load_converter(path)
+
+
+def convert_file(job):
+    """
+    Build the stale variants of one input file (runs in a worker process).
+
+    Args:
+        job: Tuple of (input_path, previous_hash, outputs, stale) where outputs
+             maps transform name -> output path and stale is the set of
+             transforms to rebuild even if the input is unchanged
+
+    Returns:
+        Tuple of (sha1, changes, error): changes maps each rebuilt transform
+        to its change records
+    """
+    input_path, previous_hash, outputs, stale = job
+    try:
+        with open(input_path, 'rb') as f:
+            data = f.read()
+        sha1 = hashlib.sha1(data).hexdigest()
+        if sha1 != previous_hash:
+            stale = set(outputs)
+        if not stale:
+            return sha1, {}, None
+
+        content = data.decode('utf-8-sig')
+        changes = {}
+        for name in stale:
+            converted, changes[name] = _converters[name].convert_subtitle(content)
+            write_atomic(outputs[name], converted)
+        return sha1, changes, None
+    except Exception as e:
+        return None, {}, str(e)
+
+
+def run(transforms=TRANSFORMS, input_dir=INPUT_DIR, workers=DEFAULT_WORKERS):
+    """
+    Bring every variant of every input subtitle up to date.
+
+    Args:
+        transforms: Transforms to apply
+        input_dir: Root of the English subtitle tree
+        workers: Worker processes
+
+    Returns:
+        Tuple of (files_converted, failed, skipped)
+    """
+    input_dir = Path(input_dir)
+    if not input_dir.exists():
+        print(f"Error: Input folder not found: {input_dir}")
+        return (0, 0, 0)
+
+    dictionary_hashes = {transform.name: file_hash(transform.dictionary) for transform in transforms}
+    inputs = scan_inputs(input_dir)
+    manifest = {path: entry for path, entry in load_json(MANIFEST_FILE).items() if path in inputs}
+    # Drop records of inputs that no longer exist
+    logs = {transform.name: {path: record for path, record in load_json(transform.log_file).items() if path in inputs}
+            for transform in transforms}
+
+    paths = []
+    jobs = []
+    skipped = 0
+    for path, (mtime_ns, size) in inputs.items():
+        entry = manifest.get(path, {})
+        built = entry.get('outputs', {})
+        directory, _, file_name = path.rpartition('/')
+
+        outputs = {}
+        stale = set()
+        for transform in transforms:
+            output_path = transform.output_dir / directory / output_name(file_name, transform.language)
+            outputs[transform.name] = str(output_path)
+            if built.get(transform.name) != dictionary_hashes[transform.name] or not output_path.exists():
+                stale.add(transform.name)
+
+        if not stale and entry.get('mtime_ns') == mtime_ns and entry.get('size') == size:
+            skipped += 1
+            continue
+        paths.append(path)
+        jobs.append((str(input_dir / path), entry.get('sha1'), outputs, stale))
+
+    print(f"Found {len(inputs)} subtitle files, {len(jobs)} to check or convert "
+          f"({', '.join(transform.name for transform in transforms)})\n")
+
+    converted = 0
+    failed = 0
+    dictionaries = [(transform.name, str(transform.dictionary)) for transform in transforms]
+    pool = None
+    try:
+        if len(jobs) < POOL_THRESHOLD or workers <= 1:
+            _init_worker(dictionaries)
+            results = map(convert_file, jobs)
+        else:
+            pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(dictionaries,))
+            chunksize = max(1, len(jobs) // (workers * 4))
+            results = pool.map(convert_file, jobs, chunksize=chunksize)
+
+        for path, job, (sha1, changes, error) in zip(paths, jobs, results):
+            if error:
+                print(f"  Error converting {path}: {error}")
+                failed += 1
+                continue
+
+            entry = manifest.setdefault(path, {'outputs': {}})
+            if entry.get('sha1') != sha1:
+                # New content: outputs of transforms not in this run are stale too
+                entry['outputs'] = {}
+            entry['mtime_ns'], entry['size'] = inputs[path]
+            entry['sha1'] = sha1
+            for name, file_changes in changes.items():
+                entry['outputs'][name] = dictionary_hashes[name]
+                logs[name][path] = {'outputFile': Path(job[2][name]).name, 'changes': file_changes}
+
+            if changes:
+                converted += 1
+            else:
+                skipped += 1
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        # Keep what finished even if the run was interrupted
+        write_atomic(MANIFEST_FILE, json.dumps(manifest, indent=1, sort_keys=True))
+        for transform in transforms:
+            write_atomic(transform.log_file, json.dumps(logs[transform.name], indent=2, ensure_ascii=False))
+
+    print(f"\n{'='*50}")
+    print("Variants complete!")
+    print(f"Files converted: {converted}")
+    print(f"Failed: {failed}")
+    print(f"Up to date: {skipped}")
+    for transform in transforms:
+        total_changes = sum(len(record['changes']) for record in logs[transform.name].values())
+        print(f"- {transform.name}: {transform.output_dir} ({total_changes} spelling changes)")
+    return (converted, failed, skipped)
+
+
+def main():
+    """Run all transforms, or only those named on the command line"""
+    names = sys.argv[1:]
+    transforms = [transform for transform in TRANSFORMS if not names or transform.name in names]
+    run(transforms)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,14 @@
+"""
+Puts the repository's common/ directory on sys.path.
+
+The modules shared by the script folders (http_client, catalog, sheet_reader,
+subtitles, ...) live once in common/. Scripts import this module before any
+of them.
+"""
+
+import os
+import sys
+
+COMMON_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'common')
+if COMMON_DIR not in sys.path:
+    sys.path.insert(0, COMMON_DIR)
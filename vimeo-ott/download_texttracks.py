@@ -1,69 +1,15 @@
 import json
-import requests
+import common_path  # puts ../common on sys.path
+import http_client
 from pathlib import Path
-import time
 import re
-from dotenv import load_dotenv
-import os
+from subtitles import parse_vtt_to_text
+from vtt_batch import convert_folder
 
 def sanitize_filename(filename):
     """Remove invalid characters from filename"""
     return re.sub(r'[<>:"/\\|?*]', '', filename)
 
-def parse_vtt_to_text(vtt_content):
-    """
-    Parse VTT content and extract plain text transcript.
-
-    Args:
-        vtt_content: String content of VTT file (not bytes)
-
-    Returns:
-        String of clean transcript text
-    """
-    # Ensure input is a string
-    if isinstance(vtt_content, bytes):
-        raise TypeError("vtt_content must be a string, not bytes. Decode bytes before calling this function.")
-
-    lines = vtt_content.split('\n')
-    transcript_lines = []
-
-    i = 0
-    while i < len(lines):
-        line = lines[i].strip()
-
-        # Skip WEBVTT header
-        if line.startswith('WEBVTT'):
-            i += 1
-            continue
-
-        # Skip empty lines
-        if not line:
-            i += 1
-            continue
-
-        # Skip cue numbers (just digits)
-        if line.isdigit():
-            i += 1
-            continue
-
-        # Skip timestamp lines (contains -->)
-        if '-->' in line:
-            i += 1
-            continue
-
-        # This should be actual caption text
-        # Clean up any VTT formatting tags like <v Name>
-        text = re.sub(r'<[^>]+>', '', line)
-        text = text.strip()
-
-        if text:
-            transcript_lines.append(text)
-
-        i += 1
-
-    # Join all lines with spaces
-    return ' '.join(transcript_lines)
-
 def convert_vtt_to_transcript(vtt_path, output_path):
     """
     Convert a VTT file to a clean transcript text file.
@@ -95,7 +41,7 @@ def convert_vtt_to_transcript(vtt_path, output_path):
 
 def convert_all_vtts_to_transcripts(transcripts_folder):
     """
-    Convert all VTT files in the transcripts folder to .txt transcript files.
+    Convert new or changed VTT files in the transcripts folder to .txt transcript files.
 
     Args:
         transcripts_folder: Path to folder containing VTT files
@@ -103,73 +49,35 @@ def convert_all_vtts_to_transcripts(transcripts_folder):
     Returns:
         Tuple of (successful_count, failed_count)
     """
-    transcripts_folder = Path(transcripts_folder)
-
-    if not transcripts_folder.exists():
-        print(f"Error: Transcripts folder not found: {transcripts_folder}")
-        return (0, 0)
-
-    vtt_files = list(transcripts_folder.glob('*.vtt'))
-
-    if not vtt_files:
-        print("No VTT files found in transcripts folder")
-        return (0, 0)
-
-    print(f"Found {len(vtt_files)} VTT files to convert\n")
-
-    successful = 0
-    failed = 0
-
-    for vtt_file in vtt_files:
-        output_path = vtt_file.with_suffix('.txt')
-
-        # Skip if transcript already exists
-        if output_path.exists():
-            print(f"Skipping {vtt_file.name} - transcript already exists")
-            continue
-
-        print(f"Converting: {vtt_file.name}")
-
-        if convert_vtt_to_transcript(vtt_file, output_path):
-            print(f"  Saved to: {output_path.name}")
-            successful += 1
-        else:
-            failed += 1
-
-    print(f"\n{'='*50}")
-    print(f"Conversion complete!")
-    print(f"Successfully converted: {successful}")
-    print(f"Failed: {failed}")
-
+    successful, failed, skipped = convert_folder(transcripts_folder)
     return (successful, failed)
 
 def get_video_id_from_uri(uri):
     """Extract video ID from URI like '/videos/1071167545'"""
     return uri.split('/')[-1]
 
-def fetch_texttracks(video_id):
-    load_dotenv()
+# Only what select_texttrack and the downloaders read
+TEXTTRACK_FIELDS = 'uri,language,active,link,type'
 
-    # Get API key from environment variable
-    api_key = os.getenv('VIMEO_API_KEY')
-    bearer_token = os.getenv('BEARER_TOKEN')
-    """Fetch texttracks for a video from Vimeo API"""
+def fetch_texttracks(video_id, fields=TEXTTRACK_FIELDS):
+    """
+    Fetch texttracks for a video from Vimeo API
 
-    url = f"https://api.vimeo.com/videos/{video_id}/texttracks"
+    Args:
+        video_id: Numeric Vimeo video ID
+        fields: Comma-separated Vimeo field projection, or None for full objects
+    """
 
-    headers = {
-        'Authorization': 'Bearer ' + bearer_token,
-        'Accept': 'application/vnd.vimeo.*+json;version=3.4',
-        'X-API-Key': api_key
-    }
+    url = f"https://api.vimeo.com/videos/{video_id}/texttracks"
 
     all_texttracks = []
     page = 1
 
     while True:
-        params = {"page": page, "per_page": 100}
-        response = requests.get(url, headers=headers, params=params)
-        time.sleep(5)
+        params = {"page": page, "per_page": http_client.VIMEO_MAX_PER_PAGE}
+        if fields:
+            params["fields"] = fields
+        response = http_client.get(url, params=params, cache_ttl=http_client.SHORT_CACHE_TTL)
         
         if response.status_code != 200:
             print(f"  Error fetching texttracks: {response.status_code}")
@@ -212,7 +120,7 @@ def select_texttrack(texttracks):
 
 def get_vtt(link):
     """Download VTT file from the given link and return as string"""
-    response = requests.get(link)
+    response = http_client.get(link)
 
 
     if response.status_code != 200:
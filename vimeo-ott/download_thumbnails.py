@@ -1,10 +1,11 @@
 import csv
 import os
 import requests
+import common_path  # puts ../common on sys.path
+import http_client
 import re
-from bs4 import BeautifulSoup
+from page_probe import probe_page
 from urllib.parse import urlparse, unquote
-import time
 from dotenv import load_dotenv
 from requests.auth import HTTPBasicAuth
 from download_texttracks import get_video_id_from_uri, fetch_texttracks, select_texttrack, get_vtt, download_vtt, sanitize_filename
@@ -45,38 +46,13 @@ def get_thumbnail_url_from_vimeo(page_url):
         print(f"  Extracted video ID: {video_id}")
 
 
-        # Call Vimeo API
-
-        load_dotenv()
-
-        # Get API key from environment variable
-        api_key = os.getenv('VIMEO_API_KEY')
-        bearer_token = os.getenv('BEARER_TOKEN')
-        """Fetch texttracks for a video from Vimeo API"""
-
+        # Call Vimeo API, asking only for the thumbnail link
         url = f"https://api.vimeo.com/videos/{video_id}"
+        params = {'fields': 'pictures.base_link'}
 
-        headers = {
-            'Authorization': 'Bearer ' + bearer_token,
-            'Accept': 'application/vnd.vimeo.*+json;version=3.4',
-            'X-API-Key': api_key
-        }
-
-        # Retry logic for rate limiting
-        max_retries = 2
-        for attempt in range(max_retries):
-            try:
-                response = requests.get(url, headers=headers, timeout=10)
-                response.raise_for_status()
-                time.sleep(15)
-                break  # Success, exit retry loop
-            except requests.exceptions.HTTPError as e:
-                if response.status_code == 429 and attempt < max_retries - 1:
-                    print(f"  Rate limit hit (429), waiting 30 seconds before retry...")
-                    time.sleep(30)
-                    continue
-                else:
-                    raise  # Re-raise the exception if it's not 429 or we're out of retries
+        # Rate limiting and 429 retries are handled by http_client
+        response = http_client.get(url, params=params, timeout=10, cache_ttl=http_client.CACHE_TTL)
+        response.raise_for_status()
 
         # Parse JSON response
         video_data = response.json()
@@ -106,25 +82,16 @@ def get_thumbnail_url_from_vimeo(page_url):
 
 def get_thumbnail_url(page_url):
     """Extract thumbnail URL from og:image meta tag"""
-    try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        response = requests.get(page_url, headers=headers, timeout=10)
-        response.raise_for_status()
-
-        soup = BeautifulSoup(response.text, 'html.parser')
-        og_image = soup.find('meta', property='og:image')
+    page = probe_page(page_url)
+    if page is None:
+        return None
 
-        if og_image and og_image.get('content'):
-            return og_image['content']
-        else:
-            print(f"  No og:image found for {page_url}")
-            return None
+    og_image = page['meta'].get('og:image')
+    if og_image:
+        return og_image
 
-    except requests.exceptions.RequestException as e:
-        print(f"  Error fetching page {page_url}: {e}")
-        return None
+    print(f"  No og:image found for {page_url}")
+    return None
     
 def get_vimeo_url(page_url):
     """Check if URL is a Vimeo URL"""
@@ -139,38 +106,25 @@ def get_vimeo_url(page_url):
 
 def get_video_url(page_url):
     """Extract video download URL from page by finding VIDEO_ID"""
-    try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        response = requests.get(page_url, headers=headers, timeout=10)
-        response.raise_for_status()
-
-        # Search for VIDEO_ID in the HTML
-        # Pattern: "VIDEO_ID":2454995
-        import re
-        match = re.search(r'"VIDEO_ID":(\d+)', response.text)
-
-        if match:
-            video_id = match.group(1)
-            api_url = f"https://api.vhx.tv/videos/{video_id}"
-            print(f"  Found VIDEO_ID: {video_id}")
-            return api_url
-
-        print(f"  No VIDEO_ID found for {page_url}")
+    # Same memoized probe as get_thumbnail_url, so the page is fetched once
+    page = probe_page(page_url)
+    if page is None:
         return None
 
-    except requests.exceptions.RequestException as e:
-        print(f"  Error fetching page {page_url}: {e}")
-        return None
+    # Pattern: "VIDEO_ID":2454995
+    video_id = page['video_id']
+    if video_id:
+        api_url = f"https://api.vhx.tv/videos/{video_id}"
+        print(f"  Found VIDEO_ID: {video_id}")
+        return api_url
+
+    print(f"  No VIDEO_ID found for {page_url}")
+    return None
 
 def download_thumbnail(thumbnail_url, video_name, row_number):
     """Download thumbnail image to thumbnails folder"""
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        response = requests.get(thumbnail_url, headers=headers, timeout=10)
+        response = http_client.get(thumbnail_url, timeout=10)
         response.raise_for_status()
 
         # Get file extension from URL
@@ -204,15 +158,9 @@ def request_vimeo_ott_api(api_url):
             print(f"\n  Error: VIMEO_API_KEY not found in .env file")
             return False
 
-        # Make API request to get video file info using Basic Auth
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-
         print(f"  Fetching video file info from API...")
-        # Basic auth with api_key as username, empty password
-        from requests.auth import HTTPBasicAuth
-        api_response = requests.get(api_url, headers=headers, auth=HTTPBasicAuth(api_key, ''), timeout=30)
+        # Session for api.vhx.tv carries Basic auth (api_key as username, empty password)
+        api_response = http_client.get(api_url, timeout=30, cache_ttl=http_client.SHORT_CACHE_TTL)
         api_response.raise_for_status()
 
         return api_response.json()
@@ -263,7 +211,7 @@ def download_texttracks_vimeo_api(video_id, video_name, row_number):
         # if not exists:
         print(f"  Downloading texttrack (language: {language})")
     # Download subtitle file
-        subtitle_response = requests.get(link, timeout=10)
+        subtitle_response = http_client.get(link, timeout=10)
         subtitle_response.raise_for_status()
 
         # Save subtitle file
@@ -272,7 +220,6 @@ def download_texttracks_vimeo_api(video_id, video_name, row_number):
         with open(filepath, 'wb') as f:
             f.write(subtitle_response.content)
         # print(f"  ✓ Downloaded subtitle: {filename}")
-        time.sleep(5)
         downloaded_languages.append(lang)
 
         return downloaded_languages
@@ -308,7 +255,7 @@ def download_texttracks_vimeo_ott(api_url, video_name, row_number):
 
             if not exists:
             # Download subtitle file
-                subtitle_response = requests.get(link, timeout=10)
+                subtitle_response = http_client.get(link, timeout=10)
                 subtitle_response.raise_for_status()
 
                 # Save subtitle file
@@ -317,7 +264,6 @@ def download_texttracks_vimeo_ott(api_url, video_name, row_number):
                 with open(filepath, 'wb') as f:
                     f.write(subtitle_response.content)
                 # print(f"  ✓ Downloaded subtitle: {filename}")
-                time.sleep(2)
             downloaded_languages.append(lang)
 
         return downloaded_languages
@@ -342,9 +288,6 @@ def download_video(api_url, video_name, row_number):
         #     return False
 
         # # Make API request to get video file info using Basic Auth
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
 
         # print(f"  Fetching video file info from API...")
         # # Basic auth with api_key as username, empty password
@@ -382,7 +325,7 @@ def download_video(api_url, video_name, row_number):
         print(f"  Found download URL")
 
         # Download the video file
-        download_response = requests.get(download_url, headers=headers, auth=HTTPBasicAuth(api_key, ''), timeout=60, stream=True)
+        download_response = http_client.get(download_url, auth=HTTPBasicAuth(api_key, ''), timeout=60, stream=True)
         download_response.raise_for_status()
 
         # Get file extension from URL or default to .mp4
@@ -1,7 +1,9 @@
 import os
 import json
 import csv
-import requests
+import common_path  # puts ../common on sys.path
+import http_client
+from paginator import iter_vhx_items
 from dotenv import load_dotenv
 from pathlib import Path
 import re
@@ -28,7 +30,7 @@ def download_thumbnail(video):
 
     try:
         # Download the thumbnail
-        img_response = requests.get(thumbnail_url, timeout=10)
+        img_response = http_client.get(thumbnail_url, timeout=10)
         img_response.raise_for_status()
 
         # Save to file
@@ -54,47 +56,14 @@ if not api_key:
 # Fetch all videos with pagination
 def fetch_all_videos(api_key):
     """Fetch all videos from the API with pagination"""
-    all_videos = []
     url = "https://api.vhx.tv/videos"
-    page = 1
-    per_page = 150
+    info = {}
 
-    while True:
-        print(f"\nFetching page {page}...")
-        query_params = {
-            'per_page': per_page,
-            'page': page
-        }
+    # Pages after the first are fetched concurrently and streamed in order
+    all_videos = list(iter_vhx_items(url, info=info))
+    print(f"Retrieved {len(all_videos)} videos")
 
-        response = requests.get(url, auth=(api_key, ''), params=query_params)
-
-        print(f"Status Code: {response.status_code}")
-
-        # Check for errors
-        if response.status_code != 200:
-            print(f"Error: {response.text}")
-            break
-
-        data = response.json()
-
-        # Get videos from this page
-        if '_embedded' in data and 'videos' in data['_embedded']:
-            videos = data['_embedded']['videos']
-            all_videos.extend(videos)
-            print(f"Retrieved {len(videos)} videos (Total so far: {len(all_videos)})")
-
-            # Check if there are more pages
-            next_link = data.get('_links', {}).get('next', {}).get('href')
-            if not next_link:
-                print(f"\nCompleted! No more pages.")
-                break
-
-            page += 1
-            # break
-        else:
-            break
-
-    return all_videos, data.get('total', 0)
+    return all_videos, info.get('total', 0)
 
 # Fetch all videos
 print("Starting to fetch all videos...")
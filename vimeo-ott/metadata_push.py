@@ -0,0 +1,138 @@
+"""
+Concurrent metadata pushes to the Vimeo API.
+
+Every call goes through http_client, so all workers share one pooled
+api.vimeo.com session, the shared rate limiter and its 429 retries. PATCHes
+run on a bounded thread pool, and each result is handed back to the caller
+as soon as it arrives. PushLog writes those results to a CSV file one row at
+a time, so an interrupted run still leaves a usable log.
+"""
+
+import csv
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+from dotenv import load_dotenv
+
+import common_path  # puts ../common on sys.path
+import catalog
+import http_client
+
+load_dotenv()
+
+API_ROOT = 'https://api.vimeo.com'
+DEFAULT_WORKERS = 4
+
+LOG_FIELDS = ['timestamp', 'title', 'vimeo_id', 'fields', 'status', 'status_info', 'updated_row', 'description']
+
+
+def upload_headers():
+    """Auth for metadata edits (VIMEO_UPLOAD_API_KEY has edit scope)"""
+    return {'Authorization': 'Bearer ' + os.getenv('VIMEO_UPLOAD_API_KEY', '')}
+
+
+def fetch_fields(video_id, fields):
+    """Current values of fields on Vimeo, or None if the video could not be fetched"""
+    try:
+        response = http_client.get(f"{API_ROOT}/videos/{video_id}", headers=upload_headers(),
+                                   params={'fields': ','.join(fields)})
+    except requests.exceptions.RequestException as e:
+        print(f"  Error fetching video {video_id}: {e}")
+        return None
+
+    if response.status_code != 200:
+        return None
+    video = response.json()
+    return {field: video.get(field) for field in fields}
+
+
+def push_video(video_id, data, hashes=None):
+    """
+    PATCH the fields of data that differ from what is live on Vimeo.
+
+    Args:
+        video_id: Numeric Vimeo video ID
+        data: Dict of field -> value to make live
+        hashes: Hashes recorded at the last push (catalog.pushed_hashes);
+                if None the live values are fetched and compared instead
+
+    Returns:
+        Dict with 'sent' (fields PATCHed), 'live' (fields now known to be live,
+        to record with catalog.record_push), 'status' and 'status_info'
+    """
+    if hashes is None:
+        remote = fetch_fields(video_id, list(data))
+        if remote is not None:
+            hashes = {field: catalog.content_hash(value) for field, value in remote.items()}
+
+    changes = catalog.changed_fields(data, hashes) if hashes is not None else dict(data)
+    live = {field: value for field, value in data.items() if field not in changes}
+    if not changes:
+        return {'sent': {}, 'live': live, 'status': 0, 'status_info': "Unchanged, not sent"}
+
+    try:
+        response = http_client.request('PATCH', f"{API_ROOT}/videos/{video_id}",
+                                       headers=upload_headers(), json=changes)
+    except requests.exceptions.RequestException as e:
+        return {'sent': {}, 'live': live, 'status': 0, 'status_info': f"Request failed: {e}"}
+
+    if response.status_code in (200, 204):
+        live.update(changes)
+        status_info = f"Updated {', '.join(changes)}"
+    else:
+        status_info = f"Response: {response.text[:500]}"
+
+    return {'sent': changes, 'live': live, 'status': response.status_code, 'status_info': status_info}
+
+
+def push_all(jobs, workers=DEFAULT_WORKERS):
+    """
+    Run push_video for many videos on a bounded worker pool.
+
+    Args:
+        jobs: Iterable of dicts with 'video_id', 'data' and optional 'hashes'
+              (any other keys are passed back untouched)
+        workers: PATCHes in flight at once
+
+    Yields:
+        (job, result) pairs in completion order
+    """
+    # One pooled connection per worker so threads never wait on the pool
+    http_client.configure(pool_size=workers)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(push_video, job['video_id'], job['data'], job.get('hashes')): job for job in jobs}
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {'sent': {}, 'live': {}, 'status': 0, 'status_info': f"Error: {e}"}
+            yield job, result
+
+
+class PushLog:
+    """CSV log written and flushed one row at a time"""
+
+    def __init__(self, path):
+        self._file = open(path, 'w', newline='', encoding='utf-8-sig')
+        self._writer = csv.DictWriter(self._file, fieldnames=LOG_FIELDS, extrasaction='ignore')
+        self._writer.writeheader()
+        self._file.flush()
+
+    def write(self, **row):
+        row.setdefault('timestamp', time.strftime('%Y-%m-%d %H:%M:%S'))
+        self._writer.writerow(row)
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
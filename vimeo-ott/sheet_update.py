@@ -1,6 +1,8 @@
 import csv
 import openpyxl
 import re
+import common_path  # puts ../common on sys.path
+from sheet_schema import load_schema
 
 # File paths
 csv_file = 'sheets/videos.csv'
@@ -37,24 +39,17 @@ if not english_sheet:
     print("ERROR: Could not find 'English Video List' sheet in Excel file")
     exit(1)
 
+# Columns written below are found by header (internal URL falls back to column U)
+schema = load_schema(excel_file, english_sheet.title, {'description': None, 'internal_url': 21})
+description_col_idx = schema.columns.get('description')
+internal_url_col_idx = schema.column('internal_url')
+
 # Read all video page links from the Excel sheet
 print("Reading Excel data...")
 excel_links = {}
-headers = None
-description_col_idx = None
 
 for idx, row in enumerate(english_sheet.iter_rows(values_only=False)):
     if idx == 0:
-        # Store headers to find the correct column
-        headers = [str(cell.value).lower() if cell.value else '' for cell in row]
-        print(f"Excel headers: {[cell.value for cell in row]}")
-
-        # Find the description column index
-        for i, header in enumerate(headers):
-            if 'description' in header:
-                description_col_idx = i
-                print(f"Found description column at index {description_col_idx}")
-                break
         continue
 
     # Find the column that contains video page links and vimeo links
@@ -115,11 +110,11 @@ with open(csv_file, 'r', encoding='utf-8-sig') as f:
             # Write description to Excel if description column exists
             if description_col_idx is not None and description:
                 # Write to the cell (row_number is already 1-indexed for Excel)
-                internal_url_cell = english_sheet.cell(row=excel_row_number, column=21)  # Column U is index 21
+                internal_url_cell = english_sheet.cell(row=excel_row_number, column=internal_url_col_idx)
                 internal_url_cell.value = video_link
 
                 
-                cell = english_sheet.cell(row=excel_row_number, column=description_col_idx + 1)
+                cell = english_sheet.cell(row=excel_row_number, column=description_col_idx)
                 cell.value = description
                 updated_row = excel_row_number
             else:
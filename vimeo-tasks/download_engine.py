@@ -0,0 +1,103 @@
+"""
+Two-stage parallel download engine.
+
+Stage 1 resolves each row's page URL to an asset (thumbnail URL or VHX API
+URL). Stage 2 transfers the bytes. Each stage has its own bounded worker
+pool, so slow page lookups never hold up downloads and vice versa: a row is
+handed to the download pool as soon as its asset has been resolved.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import common_path  # puts ../common on sys.path
+import http_client
+from thumbnails import get_thumbnail_url, download_thumbnail
+from request import get_video_url_ott
+import videos
+
+RESOLVE_WORKERS = 8
+DOWNLOAD_WORKERS = 4
+
+RESOLVERS = {
+    "thumbnails": get_thumbnail_url,
+    "videos": get_video_url_ott,
+}
+
+DOWNLOADERS = {
+    "thumbnails": download_thumbnail,
+    "videos": videos.download_video,
+}
+
+
+def _resolve(resolver, job):
+    try:
+        return resolver(job['url'])
+    except Exception as e:
+        print(f"  Error resolving {job['url']}: {e}")
+        return None
+
+
+def _download(downloader, job, asset):
+    try:
+        return downloader(job['folder_path'], asset, job['video_name'], job['row_num'])
+    except Exception as e:
+        print(f"  Error downloading {job['video_name']}: {e}")
+        return False
+
+
+def run_downloads(jobs, asset_to_download, resolve_workers=RESOLVE_WORKERS, download_workers=DOWNLOAD_WORKERS):
+    """
+    Resolve and download assets for every job.
+
+    Args:
+        jobs: List of dicts with 'folder_path', 'url', 'video_name' and 'row_num'
+        asset_to_download: "thumbnails" or "videos"
+        resolve_workers: Concurrent page/API lookups
+        download_workers: Concurrent byte transfers
+
+    Returns:
+        Tuple of (success_count, fail_count)
+    """
+    resolver = RESOLVERS[asset_to_download]
+    downloader = DOWNLOADERS[asset_to_download]
+
+    # Enough pooled connections per host for the busier stage
+    http_client.configure(pool_size=max(resolve_workers, download_workers))
+    # Concurrent progress lines would overwrite each other
+    videos.SHOW_PROGRESS = download_workers == 1
+
+    success_count = 0
+    fail_count = 0
+    counts_lock = threading.Lock()
+
+    def record(ok):
+        nonlocal success_count, fail_count
+        with counts_lock:
+            if ok:
+                success_count += 1
+            else:
+                fail_count += 1
+
+    with ThreadPoolExecutor(max_workers=resolve_workers) as resolve_pool, \
+            ThreadPoolExecutor(max_workers=download_workers) as download_pool:
+
+        resolve_futures = {resolve_pool.submit(_resolve, resolver, job): job for job in jobs}
+        download_futures = []
+
+        for future in as_completed(resolve_futures):
+            job = resolve_futures[future]
+            asset = future.result()
+
+            if not asset:
+                print(f"{job['row_num'] + 1}. No {asset_to_download[:-1]} found: {job['video_name']}")
+                record(False)
+                continue
+
+            print(f"{job['row_num'] + 1}. Processing: {job['video_name']} (API URL found)")
+            download_futures.append(download_pool.submit(_download, downloader, job, asset))
+
+        for future in as_completed(download_futures):
+            record(future.result())
+
+    return success_count, fail_count
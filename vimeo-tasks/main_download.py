@@ -1,10 +1,10 @@
 import csv
 import os
+import common_path  # puts ../common on sys.path
 from thumbnails import get_thumbnail_url, download_thumbnail
-from request import get_video_url_ott
-from videos import download_video
-from texttracks import download_texttracks_vimeo_ott, update_language_columns
-import openpyxl
+from download_engine import run_downloads
+from sheet_reader import find_sheet_name
+from sheet_schema import load_schema, iter_records
 # Load environment variables
 
 def create_folder(folder_name):
@@ -102,8 +102,7 @@ def read_csv(folder_path, file_path, endpoint, asset_to_download):
     # language_columns = fieldnames[url_idx + 1 : extras_idx]
 
 
-    success_count = 0
-    fail_count = 0
+    jobs = []
 
     for i, row in enumerate(rows):
         row_num = i + 1
@@ -117,30 +116,13 @@ def read_csv(folder_path, file_path, endpoint, asset_to_download):
             print(f"{row_num + 1}. Skipping row - no URL")
             continue
 
-        
-        if endpoint == "vimeo_ott":
-            match asset_to_download:
-                case "thumbnails":
-                    asset = get_thumbnail_url(url)
-                case "videos":
-                    asset = get_video_url_ott(url)
+        jobs.append({'folder_path': folder_path, 'url': url, 'video_name': video_name, 'row_num': row_num})
 
-        if url:
-            print(f"{row_num + 1}. Processing: {video_name} (API URL found)")
-            if asset:
-
-                if endpoint == "vimeo_ott":
-                    match asset_to_download:
-                        case "thumbnails":
-                            download_thumbnail(folder_path, asset, video_name, row_num)
-                        case "videos":
-                            download_video(folder_path, asset, video_name, row_num)
+    if endpoint == "vimeo_ott":
+        success_count, fail_count = run_downloads(jobs, asset_to_download)
+    else:
+        success_count, fail_count = 0, len(jobs)
 
-                success_count += 1
-            else:
-                fail_count += 1
-        else:
-            fail_count += 1
     print(f"\n{'='*60}")
     print(f"Video download complete!")
     print(f"Successfully downloaded : {success_count}")
@@ -154,40 +136,36 @@ def read_csv(folder_path, file_path, endpoint, asset_to_download):
     #     writer.writerows(rows)
 
 def read_xlsx(folder_path, file_path, endpoint, asset_to_download):
-    print("\nLoading Excel file...")
-    wb = openpyxl.load_workbook(file_path, read_only=False)
+    print("\nOpening Excel file (read-only)...")
 
     # Find the English Video List sheet (case-insensitive)
-    sheet = None
-    for sheet_name in wb.sheetnames:
-        if 'sheet1' in sheet_name.lower():
-            sheet = wb[sheet_name]
-            print(f"Found sheet: '{sheet_name}'")
-            break
-
-    if not sheet:
+    sheet_name = find_sheet_name(file_path, 'sheet1')
+    if not sheet_name:
         print("ERROR: Could not find 'English Video List' sheet in Excel file")
         exit(1)
-
-    video_title_col_idx = 4
-    language_col_idx = 1
-    url_col_idx = 7
+    print(f"Found sheet: '{sheet_name}'")
+
+    # Columns are found by header; these positions are only used if a header is missing
+    schema = load_schema(file_path, sheet_name, {
+        'language': 1,
+        'video_name': 4,
+        'url': 7,
+    })
     row_num = 2
 
     MAX_ROWS = 171  # Set to None to process all rows
 
-    success_count = 0
-    fail_count = 0
-
-    while True:
+    jobs = []
 
+    # Only reads the sheet, so rows are streamed instead of loading the workbook
+    rows = iter_records(file_path, sheet_name, schema, min_row=row_num,
+                        max_row=MAX_ROWS - 1 if MAX_ROWS else None)
 
-        if row_num >= MAX_ROWS:
-            print(f"Reached {MAX_ROWS} rows limit (testing mode)")
-            break
-        video_name = sheet.cell(row=row_num, column=video_title_col_idx).value
-        language = sheet.cell(row=row_num, column=language_col_idx).value
-        url = sheet.cell(row=row_num, column=url_col_idx).value
+    for record in rows:
+        row_num = record.row_number
+        video_name = record.video_name
+        language = record.language
+        url = record.url
 
         language_folder = os.path.join(folder_path, language)
         create_folder(language_folder)
@@ -196,34 +174,24 @@ def read_xlsx(folder_path, file_path, endpoint, asset_to_download):
         # print(vimeo_id, description)
         if not url:
             print(f"\nSkipping row {row_num}: Missing url")
-            row_num += 1
             continue
 
-        if endpoint == "vimeo_ott":
-            match asset_to_download:
-                case "thumbnails":
-                    asset = get_thumbnail_url(url)
-                case "videos":
-                    asset = get_video_url_ott(url)
-
-        if url:
-            print(f"{row_num + 1}. Processing: {video_name} (API URL found)")
-            if asset:
+        jobs.append({'folder_path': language_folder, 'url': url, 'video_name': video_name, 'row_num': row_num})
 
-                if endpoint == "vimeo_ott":
-                    match asset_to_download:
-                        case "thumbnails":
-                            download_thumbnail(language_folder, asset, video_name, row_num)
-                        case "videos":
-                            download_video(language_folder, asset, video_name, row_num)
+    # Rows stop at MAX_ROWS - 1, so reaching that row means the limit applied
+    if MAX_ROWS and row_num >= MAX_ROWS - 1:
+        print(f"Reached {MAX_ROWS} rows limit (testing mode)")
 
-                success_count += 1
-            else:
-                fail_count += 1
-        else:
-            fail_count += 1
+    if endpoint == "vimeo_ott":
+        success_count, fail_count = run_downloads(jobs, asset_to_download)
+    else:
+        success_count, fail_count = 0, len(jobs)
 
-        row_num += 1
+    print(f"\n{'='*60}")
+    print("Download complete!")
+    print(f"Successfully downloaded : {success_count}")
+    print(f"Failed: {fail_count}")
+    print(f"{'='*60}\n")
 
 
 
@@ -1,6 +1,9 @@
 import re
 import requests
 import os
+import common_path  # puts ../common on sys.path
+import http_client
+from page_probe import probe_page
 
 def get_vimeo_url(page_url):
     """Check if URL is a Vimeo URL"""
@@ -15,30 +18,20 @@ def get_vimeo_url(page_url):
 
 def get_video_url_ott(page_url):
     """Extract video download URL from page by finding VIDEO_ID"""
-    try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        response = requests.get(page_url, headers=headers, timeout=10)
-        response.raise_for_status()
-
-        # Search for VIDEO_ID in the HTML
-        # Pattern: "VIDEO_ID":2454995
-        import re
-        match = re.search(r'"VIDEO_ID":(\d+)', response.text)
-
-        if match:
-            video_id = match.group(1)
-            api_url = f"https://api.vhx.tv/videos/{video_id}"
-            print(f"  Found VIDEO_ID: {video_id}")
-            return api_url
-
-        print(f"  No VIDEO_ID found for {page_url}")
+    # Same memoized probe as get_thumbnail_url, so the page is fetched once
+    page = probe_page(page_url)
+    if page is None:
         return None
 
-    except requests.exceptions.RequestException as e:
-        print(f"  Error fetching page {page_url}: {e}")
-        return None
+    # Pattern: "VIDEO_ID":2454995
+    video_id = page['video_id']
+    if video_id:
+        api_url = f"https://api.vhx.tv/videos/{video_id}"
+        print(f"  Found VIDEO_ID: {video_id}")
+        return api_url
+
+    print(f"  No VIDEO_ID found for {page_url}")
+    return None
 
 
 def request_vimeo_ott_api(api_url):
@@ -50,15 +43,9 @@ def request_vimeo_ott_api(api_url):
             print(f"\n  Error: VIMEO_API_KEY not found in .env file")
             return False
 
-        # Make API request to get video file info using Basic Auth
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-
         print(f"  Fetching video file info from API...")
-        # Basic auth with api_key as username, empty password
-        from requests.auth import HTTPBasicAuth
-        api_response = requests.get(api_url, headers=headers, auth=HTTPBasicAuth(api_key, ''), timeout=30)
+        # Session for api.vhx.tv carries Basic auth (api_key as username, empty password)
+        api_response = http_client.get(api_url, timeout=30, cache_ttl=http_client.SHORT_CACHE_TTL)
         api_response.raise_for_status()
 
         return api_response.json()
@@ -1,34 +1,34 @@
 import os
 import requests
+import common_path  # puts ../common on sys.path
+import http_client
 from request import request_vimeo_ott_api 
-import time
 from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
-def fetch_texttracks(video_id):
-    load_dotenv()
+# Only what select_texttrack and the downloaders read
+TEXTTRACK_FIELDS = 'uri,language,active,link,type'
 
-    # Get API key from environment variable
-    api_key = os.getenv('VIMEO_API_KEY')
-    bearer_token = os.getenv('BEARER_TOKEN')
-    """Fetch texttracks for a video from Vimeo API"""
+def fetch_texttracks(video_id, fields=TEXTTRACK_FIELDS):
+    """
+    Fetch texttracks for a video from Vimeo API
 
-    url = f"https://api.vimeo.com/videos/{video_id}/texttracks"
+    Args:
+        video_id: Numeric Vimeo video ID
+        fields: Comma-separated Vimeo field projection, or None for full objects
+    """
 
-    headers = {
-        'Authorization': 'Bearer ' + bearer_token,
-        'Accept': 'application/vnd.vimeo.*+json;version=3.4',
-        'X-API-Key': api_key
-    }
+    url = f"https://api.vimeo.com/videos/{video_id}/texttracks"
 
     all_texttracks = []
     page = 1
 
     while True:
-        params = {"page": page, "per_page": 100}
-        response = requests.get(url, headers=headers, params=params)
-        time.sleep(5)
+        params = {"page": page, "per_page": http_client.VIMEO_MAX_PER_PAGE}
+        if fields:
+            params["fields"] = fields
+        response = http_client.get(url, params=params, cache_ttl=http_client.SHORT_CACHE_TTL)
         
         if response.status_code != 200:
             print(f"  Error fetching texttracks: {response.status_code}")
@@ -108,7 +108,7 @@ def download_texttracks_vimeo_api(video_id, video_name, row_number):
         # if not exists:
         print(f"  Downloading texttrack (language: {language})")
     # Download subtitle file
-        subtitle_response = requests.get(link, timeout=10)
+        subtitle_response = http_client.get(link, timeout=10)
         subtitle_response.raise_for_status()
 
         # Save subtitle file
@@ -117,7 +117,6 @@ def download_texttracks_vimeo_api(video_id, video_name, row_number):
         with open(filepath, 'wb') as f:
             f.write(subtitle_response.content)
         # print(f"  ✓ Downloaded subtitle: {filename}")
-        time.sleep(5)
         downloaded_languages.append(lang)
 
         return downloaded_languages
@@ -154,7 +153,7 @@ def download_texttracks_vimeo_ott(api_url, video_name, row_number):
 
             if not exists:
             # Download subtitle file
-                subtitle_response = requests.get(link, timeout=10)
+                subtitle_response = http_client.get(link, timeout=10)
                 subtitle_response.raise_for_status()
 
                 # Save subtitle file
@@ -163,7 +162,6 @@ def download_texttracks_vimeo_ott(api_url, video_name, row_number):
                 with open(filepath, 'wb') as f:
                     f.write(subtitle_response.content)
                 # print(f"  ✓ Downloaded subtitle: {filename}")
-                time.sleep(2)
             downloaded_languages.append(lang)
 
         return downloaded_languages
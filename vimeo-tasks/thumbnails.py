@@ -1,9 +1,10 @@
 import os
 import requests
+import common_path  # puts ../common on sys.path
+import http_client
 from urllib.parse import urlparse, unquote
 import re
-from bs4 import BeautifulSoup
-import time
+from page_probe import probe_page
 from dotenv import load_dotenv
 
 
@@ -25,38 +26,13 @@ def get_thumbnail_url_from_vimeo(page_url):
         print(f"  Extracted video ID: {video_id}")
 
 
-        # Call Vimeo API
-
-        load_dotenv()
-
-        # Get API key from environment variable
-        api_key = os.getenv('VIMEO_API_KEY')
-        bearer_token = os.getenv('BEARER_TOKEN')
-        """Fetch texttracks for a video from Vimeo API"""
-
+        # Call Vimeo API, asking only for the thumbnail link
         url = f"https://api.vimeo.com/videos/{video_id}"
+        params = {'fields': 'pictures.base_link'}
 
-        headers = {
-            'Authorization': 'Bearer ' + bearer_token,
-            'Accept': 'application/vnd.vimeo.*+json;version=3.4',
-            'X-API-Key': api_key
-        }
-
-        # Retry logic for rate limiting
-        max_retries = 2
-        for attempt in range(max_retries):
-            try:
-                response = requests.get(url, headers=headers, timeout=10)
-                response.raise_for_status()
-                time.sleep(15)
-                break  # Success, exit retry loop
-            except requests.exceptions.HTTPError as e:
-                if response.status_code == 429 and attempt < max_retries - 1:
-                    print(f"  Rate limit hit (429), waiting 30 seconds before retry...")
-                    time.sleep(30)
-                    continue
-                else:
-                    raise  # Re-raise the exception if it's not 429 or we're out of retries
+        # Rate limiting and 429 retries are handled by http_client
+        response = http_client.get(url, params=params, timeout=10, cache_ttl=http_client.CACHE_TTL)
+        response.raise_for_status()
 
         # Parse JSON response
         video_data = response.json()
@@ -86,34 +62,22 @@ def get_thumbnail_url_from_vimeo(page_url):
 
 def get_thumbnail_url(page_url):
     """Extract thumbnail URL from og:image meta tag"""
-    try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        response = requests.get(page_url, headers=headers, timeout=10)
-        response.raise_for_status()
-
-        soup = BeautifulSoup(response.text, 'html.parser')
-        og_image = soup.find('meta', property='og:image')
+    page = probe_page(page_url)
+    if page is None:
+        return None
 
-        if og_image and og_image.get('content'):
-            return og_image['content']
-        else:
-            print(f"  No og:image found for {page_url}")
-            return None
+    og_image = page['meta'].get('og:image')
+    if og_image:
+        return og_image
 
-    except requests.exceptions.RequestException as e:
-        print(f"  Error fetching page {page_url}: {e}")
-        return None
+    print(f"  No og:image found for {page_url}")
+    return None
 
 
 def download_thumbnail(folder_path, thumbnail_url, video_name, row_number):
     """Download thumbnail image to thumbnails folder"""
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        response = requests.get(thumbnail_url, headers=headers, timeout=10)
+        response = http_client.get(thumbnail_url, timeout=10)
         response.raise_for_status()
 
         # Get file extension from URL
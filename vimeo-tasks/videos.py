@@ -1,9 +1,284 @@
 import os
+import threading
 import requests
+import common_path  # puts ../common on sys.path
+import http_client
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from urllib.parse import urlparse, unquote
 from requests.auth import HTTPBasicAuth
 from request import request_vimeo_ott_api
 
+CHUNK_SIZE = 1024 * 1024
+# Connection drops tolerated per file before giving up
+MAX_RESUME_ATTEMPTS = 5
+
+# Fetch 1080p masters over several connections at once (opt-in)
+SEGMENTED_DOWNLOADS = False
+SEGMENT_CONNECTIONS = 4
+# Smaller files are not worth splitting
+MIN_SEGMENTED_SIZE = 64 * 1024 * 1024
+
+# Rewrite a percentage line while a file downloads. Turned off when several
+# files download at once, so each file only prints its finished line.
+SHOW_PROGRESS = True
+
+
+def _read_etag(etag_path):
+    if not os.path.exists(etag_path):
+        return None
+    with open(etag_path, 'r', encoding='utf-8') as f:
+        return f.read().strip() or None
+
+
+def _write_etag(etag_path, etag):
+    with open(etag_path, 'w', encoding='utf-8') as f:
+        f.write(etag or '')
+
+
+def _validator(response):
+    """ETag of the response, or its Last-Modified date when the server sends no ETag"""
+    return response.headers.get('ETag') or response.headers.get('Last-Modified')
+
+
+def _total_size(response):
+    """Full size of the remote file from a 200 or 206 response"""
+    if response.status_code == 206:
+        content_range = response.headers.get('Content-Range', '')
+        total = content_range.rsplit('/', 1)[-1]
+        return int(total) if total.isdigit() else 0
+    return int(response.headers.get('content-length', 0))
+
+
+def _range_start(response):
+    """First byte of a 206 response ("bytes 100-199/1000" -> 100), or None"""
+    content_range = response.headers.get('Content-Range', '')
+    start = content_range.partition(' ')[2].partition('-')[0]
+    return int(start) if start.isdigit() else None
+
+
+def download_file(url, filepath, auth=None):
+    """
+    Download a file to filepath, resuming from a .part file when possible.
+
+    Bytes go to filepath + '.part' and are renamed into place once complete.
+    The remote ETag (or Last-Modified date, if there is no ETag) is kept next
+    to the file (filepath + '.etag') so that an interrupted download can
+    continue with a Range / If-Range request, and a finished file whose size
+    and validator still match the remote copy is skipped.
+
+    Returns:
+        True if the file is complete on disk, False otherwise
+    """
+    part_path = filepath + '.part'
+    etag_path = filepath + '.etag'
+    filename = os.path.basename(filepath)
+
+    for attempt in range(MAX_RESUME_ATTEMPTS):
+        stored_etag = _read_etag(etag_path)
+        resume_from = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+
+        headers = {}
+        if resume_from and stored_etag:
+            headers['Range'] = f'bytes={resume_from}-'
+            headers['If-Range'] = stored_etag
+        else:
+            resume_from = 0
+
+        try:
+            with http_client.get(url, headers=headers, auth=auth, timeout=60, stream=True) as response:
+                if response.status_code == 416:
+                    # Stale partial file - start again
+                    os.remove(part_path)
+                    continue
+                response.raise_for_status()
+
+                if resume_from and response.status_code == 206 and _range_start(response) != resume_from:
+                    # Appending a different range would corrupt the file - start again
+                    os.remove(part_path)
+                    continue
+
+                etag = _validator(response)
+                total_size = _total_size(response)
+
+                if response.status_code != 206:
+                    resume_from = 0
+
+                    if (os.path.exists(filepath) and etag and etag == stored_etag
+                            and os.path.getsize(filepath) == total_size):
+                        print(f"   Up to date, skipping: {filename}")
+                        return True
+
+                    _write_etag(etag_path, etag)
+                elif resume_from:
+                    print(f"   Resuming {filename} from {resume_from / (1024 * 1024):.1f} MB")
+
+                downloaded = resume_from
+                with open(part_path, 'ab' if resume_from else 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                        if chunk:
+                            f.write(chunk)
+                            downloaded += len(chunk)
+                            if SHOW_PROGRESS and total_size > 0:
+                                percent = (downloaded / total_size) * 100
+                                print(f"\r   Downloading: {percent:.1f}%", end='', flush=True)
+
+            if total_size and downloaded < total_size:
+                raise requests.exceptions.ChunkedEncodingError(f"Connection closed at {downloaded} of {total_size} bytes")
+
+            os.replace(part_path, filepath)
+            print(f"\r   Downloaded: {filename}")
+            return True
+
+        except (requests.exceptions.ConnectionError,
+                requests.exceptions.ChunkedEncodingError,
+                requests.exceptions.Timeout) as e:
+            print(f"\n  Download interrupted ({e}), resuming (attempt {attempt + 2}/{MAX_RESUME_ATTEMPTS})...")
+
+    print(f"\n  Error: gave up on {filename} after {MAX_RESUME_ATTEMPTS} attempts")
+    return False
+
+
+def _pwrite(fd, data, offset, write_lock):
+    """Write data at offset without moving a shared file position"""
+    if hasattr(os, 'pwrite'):
+        view = memoryview(data)
+        while view:
+            written = os.pwrite(fd, view, offset)
+            view = view[written:]
+            offset += written
+    else:
+        # Windows has no pwrite; serialise seek + write instead
+        with write_lock:
+            os.lseek(fd, offset, os.SEEK_SET)
+            os.write(fd, data)
+
+
+def _probe_range_support(url, auth):
+    """
+    Ask for the first byte to learn the file size, validator and Range support.
+
+    Returns:
+        Tuple of (total_size, etag), where etag falls back to Last-Modified,
+        or (0, None) if Range is not supported
+    """
+    with http_client.get(url, headers={'Range': 'bytes=0-0'}, auth=auth, timeout=60, stream=True) as response:
+        response.raise_for_status()
+        if response.status_code != 206:
+            return 0, None
+        return _total_size(response), _validator(response)
+
+
+def _download_segment(url, fd, start, end, etag, auth, progress):
+    """
+    Fetch bytes start..end (inclusive) into fd, resuming within the segment on drops.
+
+    Stops early, between chunks, once progress['abort'] is set.
+    """
+    offset = start
+
+    for attempt in range(MAX_RESUME_ATTEMPTS):
+        if progress['abort'].is_set():
+            return
+        headers = {'Range': f'bytes={offset}-{end}'}
+        if etag:
+            headers['If-Range'] = etag
+
+        try:
+            with http_client.get(url, headers=headers, auth=auth, timeout=60, stream=True) as response:
+                response.raise_for_status()
+                if response.status_code != 206:
+                    raise requests.exceptions.RequestException("Remote file changed during segmented download")
+                if _range_start(response) != offset:
+                    raise requests.exceptions.RequestException(f"Server sent the wrong range for bytes {offset}-{end}")
+
+                for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                    if progress['abort'].is_set():
+                        return
+                    if chunk:
+                        _pwrite(fd, chunk, offset, progress['lock'])
+                        offset += len(chunk)
+                        progress['update'](len(chunk))
+
+            if offset > end:
+                return
+        except (requests.exceptions.ConnectionError,
+                requests.exceptions.ChunkedEncodingError,
+                requests.exceptions.Timeout):
+            continue
+
+    raise requests.exceptions.RequestException(f"Segment {start}-{end} failed after {MAX_RESUME_ATTEMPTS} attempts")
+
+
+def download_file_segmented(url, filepath, auth=None, connections=SEGMENT_CONNECTIONS):
+    """
+    Download a large file as parallel byte ranges over several connections.
+
+    The output is preallocated and each range is written in place with
+    os.pwrite, then renamed into place once every range has arrived. Falls
+    back to download_file when the server ignores Range requests or the file
+    is smaller than MIN_SEGMENTED_SIZE.
+
+    Returns:
+        True if the file is complete on disk, False otherwise
+    """
+    etag_path = filepath + '.etag'
+    segment_path = filepath + '.segments'
+    filename = os.path.basename(filepath)
+
+    total_size, etag = _probe_range_support(url, auth)
+    if total_size < MIN_SEGMENTED_SIZE:
+        return download_file(url, filepath, auth=auth)
+
+    if (os.path.exists(filepath) and etag and etag == _read_etag(etag_path)
+            and os.path.getsize(filepath) == total_size):
+        print(f"   Up to date, skipping: {filename}")
+        return True
+
+    segment_size = -(-total_size // connections)
+    ranges = [(start, min(start + segment_size, total_size) - 1)
+              for start in range(0, total_size, segment_size)]
+
+    downloaded = 0
+    lock = threading.Lock()
+
+    def update(count):
+        nonlocal downloaded
+        with lock:
+            downloaded += count
+            percent = (downloaded / total_size) * 100
+        if SHOW_PROGRESS:
+            print(f"\r   Downloading ({len(ranges)} connections): {percent:.1f}%", end='', flush=True)
+
+    # abort is set on the first failed segment so the others stop between chunks
+    progress = {'lock': threading.Lock(), 'update': update, 'abort': threading.Event()}
+
+    # Preallocate so every segment can be written at its own offset
+    with open(segment_path, 'wb') as f:
+        f.truncate(total_size)
+
+    fd = os.open(segment_path, os.O_RDWR | getattr(os, 'O_BINARY', 0))
+    pool = ThreadPoolExecutor(max_workers=len(ranges))
+    try:
+        futures = [pool.submit(_download_segment, url, fd, start, end, etag, auth, progress)
+                   for start, end in ranges]
+        for future in as_completed(futures):
+            future.result()
+    except Exception:
+        # Stop the other segments, then wait for them before closing fd
+        progress['abort'].set()
+        pool.shutdown(wait=True, cancel_futures=True)
+        os.close(fd)
+        os.remove(segment_path)
+        raise
+
+    pool.shutdown()
+    os.close(fd)
+    _write_etag(etag_path, etag)
+    os.replace(segment_path, filepath)
+    print(f"\r   Downloaded: {filename}")
+    return True
+
+
 def download_video(folder_path, api_url, video_name, row_number):
     """Download video file to videos folder using VHX API"""
     try:
@@ -13,11 +288,6 @@ def download_video(folder_path, api_url, video_name, row_number):
         #     print(f"\n  Error: VIMEO_API_KEY not found in .env file")
         #     return False
 
-        # # Make API request to get video file info using Basic Auth
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-
         # print(f"  Fetching video file info from API...")
         # # Basic auth with api_key as username, empty password
         # from requests.auth import HTTPBasicAuth
@@ -30,6 +300,7 @@ def download_video(folder_path, api_url, video_name, row_number):
         # Extract the download URL from the source href
         # Find the highest quality MP4 file (1080p, 720p, etc.)
         download_url = None
+        selected_quality = None
         quality_order = ['1080p', '720p', '540p', '360p', '240p']
 
         # Filter for MP4 files only
@@ -42,6 +313,7 @@ def download_video(folder_path, api_url, video_name, row_number):
                     if file.get('quality') == quality:
                         if '_links' in file and 'source' in file['_links']:
                             download_url = file['_links']['source']['href']
+                            selected_quality = quality
                             print(f"  Selected quality: {quality} ({file.get('size', {}).get('formatted', 'unknown size')})")
                             break
                 if download_url:
@@ -53,10 +325,6 @@ def download_video(folder_path, api_url, video_name, row_number):
 
         print(f"  Found download URL")
 
-        # Download the video file
-        download_response = requests.get(download_url, headers=headers, auth=HTTPBasicAuth(api_key, ''), timeout=60, stream=True)
-        download_response.raise_for_status()
-
         # Get file extension from URL or default to .mp4
         parsed_url = urlparse(download_url)
         path = unquote(parsed_url.path)
@@ -69,21 +337,13 @@ def download_video(folder_path, api_url, video_name, row_number):
 
         filepath = os.path.join(folder_path, filename)
 
-        # Download with progress indication
-        total_size = int(download_response.headers.get('content-length', 0))
-        downloaded = 0
+        auth = HTTPBasicAuth(api_key, '')
 
-        with open(filepath, 'wb') as f:
-            for chunk in download_response.iter_content(chunk_size=8192):
-                if chunk:
-                    f.write(chunk)
-                    downloaded += len(chunk)
-                    if total_size > 0:
-                        percent = (downloaded / total_size) * 100
-                        print(f"\r   Downloading: {percent:.1f}%", end='', flush=True)
+        if SEGMENTED_DOWNLOADS and selected_quality == '1080p':
+            return download_file_segmented(download_url, filepath, auth=auth)
 
-        print(f"\r   Downloaded: {filename}")
-        return True
+        # Download into a .part file, resuming with Range requests if interrupted
+        return download_file(download_url, filepath, auth=auth)
 
     except requests.exceptions.RequestException as e:
         print(f"\n  Error downloading video: {e}")
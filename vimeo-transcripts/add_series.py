@@ -2,10 +2,13 @@ from dotenv import load_dotenv
 from download_texttracks import get_video_id_from_uri, fetch_texttracks, select_texttrack, sanitize_filename, get_vtt, parse_vtt_to_text 
 import vimeo
 import os
-import openpyxl
 import re
 import time
 import csv
+import common_path  # puts ../common on sys.path
+from sheet_reader import find_sheet_name
+from sheet_schema import load_schema, iter_records
+from sheet_writer import SheetWriter
 
 
 
@@ -21,27 +24,28 @@ excel_file = 'assets/Caravan English Videos List (1-7-2026) Tags.xlsx'
 log_file = 'sheets/upload_log.csv'
 
 
-print("\nLoading Excel file...")
-wb = openpyxl.load_workbook(excel_file, read_only=False)
+print("\nOpening Excel file (read-only)...")
 
 # Find the English Video List sheet (case-insensitive)
-english_sheet = None
-for sheet_name in wb.sheetnames:
-    if 'english video list' in sheet_name.lower():
-        english_sheet = wb[sheet_name]
-        print(f"Found sheet: '{sheet_name}'")
-        break
-
-if not english_sheet:
+sheet_name = find_sheet_name(excel_file, 'english video list')
+if not sheet_name:
     print("ERROR: Could not find 'English Video List' sheet in Excel file")
     exit(1)
+print(f"Found sheet: '{sheet_name}'")
 
 results = []
-description_col_idx = 9
-vimeo_id_col_idx = 20
-vimeo_name_col_idx = 4
 row_counter = 1000
-transcript_col_idx = 21 # Column U is index 21
+
+# Columns are found by header; these positions are only used if a header is missing
+schema = load_schema(excel_file, sheet_name, {
+    'teacher': 7,
+    'series': 5,
+    'description': 9,
+    'vimeo_link': 20,
+    'video_name': 4,
+    'transcript': 21,
+})
+series_col_idx = schema.column('series')
 
 MAX_ROWS = 1834  # Set to None to process all rows
 
@@ -51,21 +55,23 @@ failed = 0
 skipped = 0
 series_name = ""
 
+# Rows are streamed read-only; series names are journaled and written back
+# in one save when the writer closes (or on exit / Ctrl+C)
+writer = SheetWriter(None, excel_file)
+rows = iter_records(excel_file, sheet_name, schema, min_row=row_counter,
+                    max_row=MAX_ROWS - 1 if MAX_ROWS else None)
 
-while True:
+for record in rows:
+    row_counter = record.row_number
     status = 0
     status_info = "default"
 
-    if MAX_ROWS and row_counter >= MAX_ROWS:
-        print(f"Reached {MAX_ROWS} rows limit (testing mode)")
-        break
-
-    teacher = english_sheet.cell(row=row_counter, column=7).value
-    series = english_sheet.cell(row=row_counter, column=5).value
-    vimeo_id = english_sheet.cell(row=row_counter, column=vimeo_id_col_idx).value
-    description = english_sheet.cell(row=row_counter, column=description_col_idx).value
-    transcripts = english_sheet.cell(row=row_counter, column=transcript_col_idx).value
-    vimeo_name = english_sheet.cell(row=row_counter, column=vimeo_name_col_idx).value
+    teacher = record.teacher
+    series = record.series
+    vimeo_id = record.vimeo_link
+    description = record.description
+    transcripts = record.transcript
+    vimeo_name = record.video_name
 
     # Check if we've reached the end of the data
     # if not vimeo_id and not description and not transcripts:
@@ -84,13 +90,11 @@ while True:
     #     continue
     else:
 
-        series_cell = english_sheet.cell(row=row_counter, column=5)
-        series_cell.value = series_name
-        wb.save(excel_file)
+        writer.set(sheet_name, row_counter, series_col_idx, series_name)
         print(f" Added series name {series_name} to Excel (Row {row_counter}, {vimeo_name})")
         successful += 1
 
-    row_counter += 1
+writer.close()
 
 # Write results to log.csv
 # print("\nWriting results to log.csv...")
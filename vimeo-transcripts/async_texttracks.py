@@ -0,0 +1,84 @@
+"""
+Concurrent texttrack fetching for a whole catalog.
+
+Runs fetch_texttracks / select_texttrack / get_vtt for many videos at once on
+worker threads. Every Vimeo call still goes through http_client, so the shared
+rate limiter keeps the combined request rate inside the API budget.
+"""
+
+import asyncio
+
+import common_path  # puts ../common on sys.path
+import http_client
+from download_texttracks import fetch_texttracks, select_texttrack, get_vtt, parse_vtt_to_text
+
+DEFAULT_CONCURRENCY = 8
+
+
+def fetch_transcript(video_id):
+    """
+    Fetch the preferred English texttrack for one video and parse it to text.
+
+    Args:
+        video_id: Numeric Vimeo video ID
+
+    Returns:
+        Tuple of (transcript, status_info); transcript is None on failure
+    """
+    texttracks = fetch_texttracks(video_id)
+
+    if texttracks is None:
+        return None, "Failed to fetch texttracks"
+    if not texttracks:
+        return None, "No texttracks available"
+
+    selected = select_texttrack(texttracks)
+    if not selected:
+        return None, "No suitable texttrack found"
+
+    autogen, selected_track = selected
+    link = selected_track.get("link")
+    if not link:
+        return None, "No download link available"
+
+    texttrack = get_vtt(link)
+    if not texttrack:
+        return None, "Failed to download texttrack"
+
+    transcript = parse_vtt_to_text(texttrack)
+    return transcript, f"Parsed {len(transcript)} characters (language: {selected_track.get('language')})"
+
+
+async def fetch_transcripts(jobs, concurrency=DEFAULT_CONCURRENCY):
+    """
+    Fetch transcripts for many videos concurrently.
+
+    Args:
+        jobs: Iterable of (key, video_id) pairs, e.g. (row number, Vimeo ID)
+        concurrency: Maximum number of videos in flight at once
+
+    Returns:
+        Dict of key -> (transcript, status_info)
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    results = {}
+
+    async def worker(key, video_id):
+        async with semaphore:
+            try:
+                results[key] = await asyncio.to_thread(fetch_transcript, video_id)
+            except Exception as e:
+                results[key] = (None, f"Error processing texttrack: {e}")
+        transcript, status_info = results[key]
+        marker = "✓" if transcript else "✗"
+        print(f"  {marker} {key} (ID: {video_id}): {status_info}")
+
+    await asyncio.gather(*(worker(key, video_id) for key, video_id in jobs))
+    return results
+
+
+def fetch_all_transcripts(jobs, concurrency=DEFAULT_CONCURRENCY):
+    """Blocking wrapper around fetch_transcripts for use from scripts"""
+    # One pooled connection per worker so threads never wait on the pool
+    http_client.configure(pool_size=concurrency)
+    return asyncio.run(fetch_transcripts(jobs, concurrency))
@@ -1,13 +1,13 @@
 from openai import OpenAI
 import anthropic
 import os
-import openpyxl
-import difflib
 from dotenv import load_dotenv
 import shutil
-import json
 from datetime import datetime
-import tempfile
+import common_path  # puts ../common on sys.path
+import catalog
+import planner
+from tag_index import TagIndex
 
 
 def load_all_tags(csv_path):
@@ -15,8 +15,8 @@ def load_all_tags(csv_path):
     with open(csv_path, 'r', encoding='utf-8') as f:
         tags = [line.strip() for line in f if line.strip()]
 
-    # Create lookup: normalized -> original
-    tag_lookup = {tag.lower().strip(): tag for tag in tags}
+    # Create lookup: normalized -> original, indexed once for fuzzy matching
+    tag_lookup = TagIndex({tag.lower().strip(): tag for tag in tags})
     return tag_lookup
 
 
@@ -35,12 +35,11 @@ def validate_and_match_tags(response_tags, tag_lookup):
             matched_tags.append(tag_lookup[tag_normalized])
             # logs.append(f"✓ Exact match: '{tag}' -> '{tag_lookup[tag_normalized]}'")
         else:
-            # Fuzzy match
-            all_tags = list(tag_lookup.keys())
-            matches = difflib.get_close_matches(tag_normalized, all_tags, n=1, cutoff=0.95)
+            # Fuzzy match against the trigram shortlist
+            match = tag_lookup.closest(tag_normalized, cutoff=0.95)
 
-            if matches:
-                matched_tag = tag_lookup[matches[0]]
+            if match:
+                matched_tag = tag_lookup[match]
                 matched_tags.append(matched_tag)
                 logs.append(f"⚠ Fuzzy match: '{tag}' -> '{matched_tag}' (similarity check)")
             else:
@@ -166,99 +165,29 @@ def create_backup(file_path):
     return backup_path
 
 
-def save_workbook_safely(workbook, file_path):
-    """Save workbook using atomic write (temp file + rename)"""
-    # Create a temporary file in the same directory
-    temp_fd, temp_path = tempfile.mkstemp(suffix='.xlsx', dir=os.path.dirname(file_path))
-    os.close(temp_fd)  # Close the file descriptor
-
-    try:
-        # Save to temp file
-        workbook.save(temp_path)
-
-        # If save succeeded, replace original file
-        if os.path.exists(file_path):
-            os.remove(file_path)
-        shutil.move(temp_path, file_path)
-
-        return True
-    except Exception as e:
-        # Clean up temp file if it exists
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
-        raise e
-
-
-def load_progress(progress_file):
-    """Load progress from JSON file"""
-    if os.path.exists(progress_file):
-        with open(progress_file, 'r') as f:
-            return json.load(f)
-    return {"last_processed_row": 1, "completed_rows": []}
-
-
-def save_progress(progress_file, row_number, completed_rows):
-    """Save progress to JSON file"""
-    progress = {
-        "last_processed_row": row_number,
-        "completed_rows": completed_rows,
-        "last_update": datetime.now().isoformat()
-    }
-    with open(progress_file, 'w') as f:
-        json.dump(progress, f, indent=2)
-
-
 # Example usage
 if __name__ == "__main__":
     load_dotenv()
 
     excel_file = 'assets/Caravan English Video RAG List.xlsx'
-    progress_file = 'assets/progress.json'
 
     # Create backup before starting
     print("\n=== Creating backup ===")
     backup_file = create_backup(excel_file)
 
-    # Load progress
-    # print("\n=== Loading progress ===")
-    # progress = load_progress(progress_file)
-    # print(f"Last processed row: {progress['last_processed_row']}")
-    # print(f"Total completed rows: {len(progress['completed_rows'])}")
-
-    print("\n=== Loading Excel file ===")
-    wb = openpyxl.load_workbook(excel_file, read_only=False)
-
-    # Find the English Video List sheet (case-insensitive)
-    english_sheet = None
-    for sheet_name in wb.sheetnames:
-        if 'english video list' in sheet_name.lower():
-            english_sheet = wb[sheet_name]
-            print(f"Found sheet: '{sheet_name}'")
-            break
-
+    print("\n=== Syncing catalog ===")
 
-    if not english_sheet:
-        print("ERROR: Could not find 'English Video List' sheet in Excel file")
-        exit(1)
+    # The catalog only re-reads the workbook when it has changed, and the
+    # planner hands out just the workbook's videos with a transcript but no tags yet
+    connection = catalog.connect()
+    catalog.sync_sheet(connection, excel_file, columns=catalog.RAG_LIST_COLUMNS)
+    planner.plan(connection, ['tags'], source=excel_file)
 
-
-    category_col_idx = 3
-    video_name_col_idx = 4
-    video_length_col_idx = 5
-    teacher_col_idx = 6
-    description_col_idx = 15
-    transcript_col_idx = 27 # Column U is index 21
-    first_tag_col_idx = 28 # Column V is index 22
-    row_counter = 2
-    # row_counter = max(2, progress['last_processed_row'])  # Resume from last progress
-
-    MAX_ROWS = 1720  # Set to None to process all rows
+    MAX_VIDEOS = None  # Set a number to cap a test run
 
     # Initialize counters
     successful = 0
     failed = 0
-    skipped = 0
-    # completed_rows = progress['completed_rows'].copy()
 
     # CSV file path
     csv_path = "assets/Tags.csv"
@@ -267,170 +196,107 @@ if __name__ == "__main__":
     tag_lookup = load_all_tags(csv_path)
     print(f"Loaded {len(tag_lookup)} tags from CSV\n")
 
-    # Save interval (save every N successful updates)
-    SAVE_INTERVAL = 5
-    updates_since_save = 0
-
-    while True:
-        status = 0
-        status_info = "default"
-
-        if MAX_ROWS and row_counter >= MAX_ROWS:
-            print(f"Reached {MAX_ROWS} rows limit (testing mode)")
-            break
-
-        category = english_sheet.cell(row=row_counter, column=category_col_idx).value
-        video_name = english_sheet.cell(row=row_counter, column=video_name_col_idx).value
-        video_length = english_sheet.cell(row=row_counter, column=video_length_col_idx).value
-        teacher = english_sheet.cell(row=row_counter, column=teacher_col_idx).value
-        description = english_sheet.cell(row=row_counter, column=description_col_idx).value
-        transcripts = english_sheet.cell(row=row_counter, column=transcript_col_idx).value
-        tag = english_sheet.cell(row=row_counter, column=first_tag_col_idx).value
-
-
-
-        if not transcripts:
-            # print(f"\nSkipping row {row_counter}: no transcript available")
-            skipped += 1
-            row_counter += 1
-            continue
-        elif tag:
-            # print(f"\nSkipping row {row_counter}: tags already exist")
-            skipped += 1
-            # completed_rows.append(row_counter)  # Track as completed
-            row_counter += 1
-            continue
-        else:
-            # Video information
-            video_info = {
-                "category": category,
-                "video_name": video_name,
-                "description": description,
-                "transcripts": transcripts
-            }
+    for video in catalog.pending(connection, 'tags', MAX_VIDEOS, source=excel_file):
+        vimeo_id = video['vimeo_id']
+        video_name = video['video_name']
+
+        # Video information
+        video_info = {
+            "category": video['category'],
+            "video_name": video_name,
+            "description": video['description'],
+            "transcripts": video['transcript']
+        }
+        
+        # Query
+        query = (
+            "Analyze the video transcript and description to identify its PRIMARY themes and main focus areas. "
+            "Pick the 10 most relevant unique tags from the CSV that represent CENTRAL themes of the video. "
+            "You may provide less than 10 tags if the next most relevant tag is too unrelated to the content of the video. "
+            "\n"
+            "CRITICAL TAG SELECTION CRITERIA:\n"
+            "1. Each tag must represent a MAIN focus or substantial theme in the video, not just a passing mention\n"
+            "2. If a concept is only mentioned briefly or in passing (1-2 times), do NOT select it as a tag\n"
+            "3. The video should spend meaningful time discussing or demonstrating the tagged concept\n"
+            "4. Ask yourself: 'Is this tag a primary reason someone would watch this video?' If no, don't use it\n"
+            "5. Prioritize tags that match the video's category and intended learning outcomes\n"
+            "\n"
+            "FORMATTING REQUIREMENTS:\n"
+            "- Tags MUST be exclusively chosen from and EXACTLY as written in the provided CSV tag list\n"
+            "- Copy each tag character-for-character from the CSV - do not create, modify, or paraphrase any tags\n"
+            "- Double-check that every tag you select appears in the CSV list above\n"
+            "- Tags should be unique and should not include any duplicates\n"
+            "- Format: Provide tags separated by commas without spaces after commas (tag1,tag2,tag3)\n"
+            "- Provide ONLY the tags in your response, no other text or formatting"
+            "- If you cannot find any relevant tags, return 'None'"
+        ) \
+        
+        # Make the request
+        try:
             
-            # Query
-            query = (
-                "Analyze the video transcript and description to identify its PRIMARY themes and main focus areas. "
-                "Pick the 10 most relevant unique tags from the CSV that represent CENTRAL themes of the video. "
-                "You may provide less than 10 tags if the next most relevant tag is too unrelated to the content of the video. "
-                "\n"
-                "CRITICAL TAG SELECTION CRITERIA:\n"
-                "1. Each tag must represent a MAIN focus or substantial theme in the video, not just a passing mention\n"
-                "2. If a concept is only mentioned briefly or in passing (1-2 times), do NOT select it as a tag\n"
-                "3. The video should spend meaningful time discussing or demonstrating the tagged concept\n"
-                "4. Ask yourself: 'Is this tag a primary reason someone would watch this video?' If no, don't use it\n"
-                "5. Prioritize tags that match the video's category and intended learning outcomes\n"
-                "\n"
-                "FORMATTING REQUIREMENTS:\n"
-                "- Tags MUST be exclusively chosen from and EXACTLY as written in the provided CSV tag list\n"
-                "- Copy each tag character-for-character from the CSV - do not create, modify, or paraphrase any tags\n"
-                "- Double-check that every tag you select appears in the CSV list above\n"
-                "- Tags should be unique and should not include any duplicates\n"
-                "- Format: Provide tags separated by commas without spaces after commas (tag1,tag2,tag3)\n"
-                "- Provide ONLY the tags in your response, no other text or formatting"
-                "- If you cannot find any relevant tags, return 'None'"
-            ) \
-            
-            # Make the request
-            try:
-                
-
-                highest_tag_count = 0
-                retry_count = 1
-                max_retries = 3
-                saved_matched_tags = []
-                saved_validation_logs = []
-
-                while retry_count <= max_retries and highest_tag_count < 5:
-                    response = query_llm_with_video_and_csv(
-                        query=query,
-                        csv_path=csv_path,
-                        video_info=video_info,
-                        model_provider="anthropic",  # Change to "openai" to use OpenAI models
-                        # model_name="gpt-4o"  # Optionally specify a different model
-                    )
-                    print(f"\n{row_counter}: {video_name}")
-                    print(f"Attempt {retry_count}; Raw response: {response}")
-
-                    # Validate and match tags
-                    response_tags = response.strip().split(',')
-                    matched_tags, validation_logs = validate_and_match_tags(response_tags, tag_lookup)
-                    if len(matched_tags) > highest_tag_count:
-                        highest_tag_count = len(matched_tags)
-                        saved_matched_tags = matched_tags
-                        saved_validation_logs = validation_logs
-                    retry_count += 1
-                    if matched_tags[0] == 'None':
-                        print(f"Received 'None' as response")
-                        retry_count += 10
-                    print(f"Matched tags: {matched_tags} (Count: {len(matched_tags)})")
-
-                # Print validation logs
-                for log in validation_logs:
-                    print(log)
-
-                # Write matched tags to Excel
-                for index, tag in enumerate(matched_tags):
-                    tag_cell = english_sheet.cell(row=row_counter, column=first_tag_col_idx + index)
-                    tag_cell.value = tag
-
-                print(f"✓ Wrote {len(matched_tags)} tags to Excel")
-                successful += 1
-                updates_since_save += 1
-                # completed_rows.append(row_counter)
-
-                # Save periodically using atomic write
-                if updates_since_save >= SAVE_INTERVAL:
-                    try:
-                        print(f"\n⏳ Saving workbook (atomic write)...")
-                        save_workbook_safely(wb, excel_file)
-                        print(f"✓ Workbook saved successfully")
-
-                        # Save progress
-                        # save_progress(progress_file, row_counter, completed_rows)
-                        # print(f"✓ Progress saved")
-
-                        updates_since_save = 0
-                    except Exception as save_error:
-                        print(f"❌ Save failed: {save_error}")
-                        print(f"⚠ Progress not saved. Will retry on next interval.")
-
-            except KeyboardInterrupt:
-                print("\n\n⚠ Interrupted by user. Saving progress...")
-                try:
-                    save_workbook_safely(wb, excel_file)
-                    # save_progress(progress_file, row_counter - 1, completed_rows)
-                    # print("✓ Progress saved. You can resume later.")
-                except Exception as e:
-                    print(f"❌ Failed to save progress: {e}")
-                raise
-
-            except Exception as e:
-                print(f"❌ Error: {e}")
-                failed += 1
-
-        row_counter += 1
+
+            highest_tag_count = 0
+            retry_count = 1
+            max_retries = 3
+            saved_matched_tags = []
+            saved_validation_logs = []
+
+            while retry_count <= max_retries and highest_tag_count < 5:
+                response = query_llm_with_video_and_csv(
+                    query=query,
+                    csv_path=csv_path,
+                    video_info=video_info,
+                    model_provider="anthropic",  # Change to "openai" to use OpenAI models
+                    # model_name="gpt-4o"  # Optionally specify a different model
+                )
+                print(f"\n{vimeo_id}: {video_name}")
+                print(f"Attempt {retry_count}; Raw response: {response}")
+
+                # Validate and match tags
+                response_tags = response.strip().split(',')
+                matched_tags, validation_logs = validate_and_match_tags(response_tags, tag_lookup)
+                if len(matched_tags) > highest_tag_count:
+                    highest_tag_count = len(matched_tags)
+                    saved_matched_tags = matched_tags
+                    saved_validation_logs = validation_logs
+                retry_count += 1
+                if matched_tags[0] == 'None':
+                    print(f"Received 'None' as response")
+                    retry_count += 10
+                print(f"Matched tags: {matched_tags} (Count: {len(matched_tags)})")
+
+            # Print validation logs
+            for log in validation_logs:
+                print(log)
+
+            # Stored in the catalog immediately; exported to Excel at the end
+            catalog.update(connection, vimeo_id, tags=matched_tags)
+
+            print(f"✓ Saved {len(matched_tags)} tags to the catalog")
+            successful += 1
+
+        except KeyboardInterrupt:
+            print("\n\n⚠ Interrupted by user. Tags saved so far are in the catalog and will be exported.")
+            raise
+
+        except Exception as e:
+            print(f"❌ Error: {e}")
+            failed += 1
 
     # Final save at the end
     print("\n\n=== Final Save ===")
     try:
-        if updates_since_save > 0:
-            print("⏳ Saving final changes...")
-            save_workbook_safely(wb, excel_file)
-            # save_progress(progress_file, row_counter, completed_rows)
-            print("✓ Final save completed")
-        else:
-            print("No unsaved changes")
+        print("⏳ Exporting tags to Excel...")
+        catalog.export_sheet(connection, excel_file, ('tags',), columns=catalog.RAG_LIST_COLUMNS)
+        print("✓ Final save completed")
     except Exception as e:
         print(f"❌ Final save failed: {e}")
+        print(f"⚠ Tags are still in {catalog.CATALOG_PATH} and will be exported on the next run")
 
     # Print summary
     print("\n\n=== Summary ===")
     print(f"Successful: {successful}")
     print(f"Failed: {failed}")
-    print(f"Skipped: {skipped}")
-    # print(f"Total completed rows: {len(completed_rows)}")
+    print(f"Still pending: {catalog.count_pending(connection, 'tags', source=excel_file)}")
     if backup_file:
-        print(f"\nBackup file: {backup_file}")
-    print(f"Progress file: {progress_file}")
\ No newline at end of file
+        print(f"\nBackup file: {backup_file}")
\ No newline at end of file
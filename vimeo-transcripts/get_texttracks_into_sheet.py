@@ -1,10 +1,10 @@
 from dotenv import load_dotenv
-from download_texttracks import get_video_id_from_uri, fetch_texttracks, select_texttrack, sanitize_filename, get_vtt, parse_vtt_to_text 
+import common_path  # puts ../common on sys.path
+from async_texttracks import fetch_transcript, fetch_all_transcripts
+import catalog
+import planner
 import vimeo
 import os
-import openpyxl
-import re
-import time
 import csv
 
 
@@ -21,131 +21,48 @@ excel_file = 'assets/Caravan English Video RAG List.xlsx'
 log_file = 'sheets/upload_log.csv'
 
 
-print("\nLoading Excel file...")
-wb = openpyxl.load_workbook(excel_file, read_only=False)
-
-# Find the English Video List sheet (case-insensitive)
-english_sheet = None
-for sheet_name in wb.sheetnames:
-    if 'english video list' in sheet_name.lower():
-        english_sheet = wb[sheet_name]
-        print(f"Found sheet: '{sheet_name}'")
-        break
-
-if not english_sheet:
-    print("ERROR: Could not find 'English Video List' sheet in Excel file")
-    exit(1)
-
-results = []
-description_col_idx = 15
-vimeo_id_col_idx = 26
-vimeo_name_col_idx = 4
-row_counter = 2
-transcript_col_idx = 27 # Column U is index 21
-
-MAX_ROWS = 1720  # Set to None to process all rows
+MAX_VIDEOS = None  # Set a number to cap a test run
 
 # Initialize counters
 successful = 0
 failed = 0
-skipped = 0
-
-
-
-while True:
-    status = 0
-    status_info = "default"
-
-    if MAX_ROWS and row_counter >= MAX_ROWS:
-        print(f"Reached {MAX_ROWS} rows limit (testing mode)")
-        break
-
-    vimeo_id = english_sheet.cell(row=row_counter, column=vimeo_id_col_idx).value
-    description = english_sheet.cell(row=row_counter, column=description_col_idx).value
-    transcripts = english_sheet.cell(row=row_counter, column=transcript_col_idx).value
-    vimeo_name = english_sheet.cell(row=row_counter, column=vimeo_name_col_idx).value
-
-    # Check if we've reached the end of the data
-    # if not vimeo_id and not description and not transcripts:
-    #     print(f"\nReached end of data at row {row_counter}")
-    #     break
-    # print(row)
-    # print(vimeo_id, description)
-    if not vimeo_id:
-        # print(f"\nSkipping row {row_counter}: Missing Vimeo ID")
-        skipped += 1
-        row_counter += 1
-        continue
-    elif transcripts:
-        # print(f"\nSkipping row {row_counter}: Transcript already exists")
-        skipped += 1
-        row_counter += 1
-        continue
-    else:
-        print(f"\nProcessing row {row_counter}: {vimeo_name}")
-        match1 = re.search(r'vimeo\.com/(\d+)', vimeo_id if vimeo_id else '')
-        video_id = match1.group(1) if match1 else None
-
-
-    
-
-        # Fetch texttracks
-        texttracks = fetch_texttracks(video_id)
-
-        if texttracks is None:
-            print(f"  Failed to fetch texttracks")
-            failed += 1
-            row_counter += 1
-            continue
 
-        if not texttracks:
-            print(f"  No texttracks available")
-            row_counter += 1
-            failed += 1
-            continue
-
-        # Select appropriate texttrack
-        autogen, selected_track = select_texttrack(texttracks)
-
-        # Check if transcript already exists
+ASYNC_MODE = True  # Fetch many videos at once
+CONCURRENCY = 8  # Videos in flight at once in ASYNC_MODE
 
-        # Download the VTT file
-        link = selected_track.get("link")
-        language = selected_track.get("language")
-
-        if not link:
-            print(f"  No download link available")
-            failed += 1
-            continue
 
+def transcript_worker(row):
+    """Fetch one pending video's transcript for planner.run"""
+    print(f"\nProcessing: {row['video_name']}")
+    transcript, status_info = fetch_transcript(row['vimeo_id'])
+    print(f"  {status_info}")
+    return {'transcript': transcript} if transcript else None
 
-        print(f"  Downloading texttrack (language: {language})")
 
-        try:
-            texttrack = get_vtt(link)
-            if not texttrack:
-                print(f"  Failed to download texttrack")
-                failed += 1
-                row_counter += 1
-                continue
+# The catalog only re-reads the workbook when it has changed, and the planner
+# hands out just the workbook's videos that still have no transcript
+connection = catalog.connect()
+catalog.sync_sheet(connection, excel_file, columns=catalog.RAG_LIST_COLUMNS)
+planner.plan(connection, ['transcript'], source=excel_file)
 
-            print(f"  Downloaded {len(texttrack)} characters")
-            # print(texttrack[:200] + "..." if texttrack and len(texttrack) > 200 else texttrack)
+if ASYNC_MODE:
+    jobs = [(row['vimeo_id'], row['vimeo_id']) for row in catalog.pending(connection, 'transcript', MAX_VIDEOS, source=excel_file)]
 
-            transcript = parse_vtt_to_text(texttrack)
-            print(f"  Parsed transcript: {len(transcript)} characters")
+    print(f"\nFetching {len(jobs)} transcripts ({CONCURRENCY} at a time)...")
+    fetched = fetch_all_transcripts(jobs, CONCURRENCY)
 
-            transcript_cell = english_sheet.cell(row=row_counter, column=transcript_col_idx)
-            transcript_cell.value = transcript
-            wb.save(excel_file)
-            print(f"  Saved transcript to Excel (Row {row_counter}, Column {transcript_col_idx})")
+    for vimeo_id, (transcript, status_info) in fetched.items():
+        if transcript:
+            catalog.update(connection, vimeo_id, transcript=transcript)
             successful += 1
-            time.sleep(20)
-        except Exception as e:
-            print(f"  Error processing texttrack: {e}")
+        else:
             failed += 1
+else:
+    successful, failed = planner.run(connection, 'transcript', transcript_worker, limit=MAX_VIDEOS, workers=1,
+                                     source=excel_file)
 
-    row_counter += 1
+# Transcripts go back into the workbook in one save
+catalog.export_sheet(connection, excel_file, ('transcript',), columns=catalog.RAG_LIST_COLUMNS)
 
 # Write results to log.csv
 # print("\nWriting results to log.csv...")
@@ -160,6 +77,5 @@ print(f"\n{'='*60}")
 print(f"Processing complete!")
 print(f"Successfully processed: {successful}")
 print(f"Failed: {failed}")
-print(f"Skipped: {skipped}")
-print(f"Total rows processed: {row_counter - 2}")
+print(f"Still pending: {catalog.count_pending(connection, 'transcript', source=excel_file)}")
 print(f"{'='*60}")
\ No newline at end of file
@@ -1,7 +1,8 @@
 import os
 import json
 import csv
-import requests
+import common_path  # puts ../common on sys.path
+from paginator import iter_vimeo_items
 from dotenv import load_dotenv
 from pathlib import Path
 import re
@@ -24,47 +25,18 @@ bearer_token = os.getenv('BEARER_TOKEN')
 if not api_key:
     raise ValueError("VIMEO_API_KEY not found in .env file")
 
+# The fields written to the CSV below, plus the ones catalog.import_vimeo_json
+# reads back from all_english_videos.json
+VIDEO_LIST_FIELDS = 'uri,name,description,link,embed.html'
+
 # Fetch all videos with pagination
-def fetch_all_videos(api_key):
+def fetch_all_videos(api_key, fields=VIDEO_LIST_FIELDS):
 
     """Fetch all videos from the API with pagination"""
-    all_videos = []
-
     url = 'https://api.vimeo.com/users/90373291/folders/24697474/videos'
 
-    headers = {
-        'Authorization': 'Bearer ' + bearer_token,
-        'Accept': 'application/vnd.vimeo.*+json;version=3.4',
-        'X-API-Key': api_key
-    }
-
-    page = 1
-    while url:
-        print(f"Fetching page {page}...")
-        response = requests.get(url, headers=headers)
-
-        print(f"Status Code: {response.status_code}")
-
-        # Check for errors
-        if response.status_code != 200:
-            print(f"Error: {response.text}")
-            break
-
-        data = response.json()
-
-        # Get videos from this page
-        videos = data.get('data', [])
-        all_videos.extend(videos)
-        print(f"Retrieved {len(videos)} videos from page {page} (Total: {len(all_videos)})")
-
-
-        # Check for next page
-        paging = data.get('paging', {})
-        if not paging.get('next'):
-            print(f"\nCompleted! No more pages.")
-            break
-        url = 'https://api.vimeo.com/' + paging.get('next')
-        page += 1
+    # Pages after the first are fetched concurrently and streamed in order
+    all_videos = list(iter_vimeo_items(url, fields=fields))
 
     # Save all videos to JSON file
     with open('all_english_videos.json', 'w', encoding='utf-8') as f:
@@ -73,13 +45,9 @@ def fetch_all_videos(api_key):
     print(f"\nCompleted! Total videos fetched: {len(all_videos)}")
     return all_videos
 
-# Fetch all videos
+# Fetch all videos (pages come from the HTTP cache and are revalidated with the API)
 print("Starting to fetch all videos...")
-if os.path.exists('all_english_videos.json'):
-    with open('all_english_videos.json', 'r', encoding='utf-8') as f:
-        all_videos = json.load(f)['data']
-else:
-    all_videos = fetch_all_videos(api_key)
+all_videos = fetch_all_videos(api_key)
 
 # for video in all_videos:
 #     print(f"{video['name']}: {video['embed']['html']}")
@@ -1,45 +1,66 @@
-import pandas as pd
+import csv
+import json
+import common_path  # puts ../common on sys.path
+import catalog
+from sheet_reader import find_sheet_name, iter_rows, cell_value
+from sheet_schema import load_schema
 
+RAG_FILE = 'assets/Caravan English Video RAG List.xlsx'
+TAGS_FILE = 'assets/Caravan English Videos List (1-7-2026) Tags.xlsx'
+MERGED_FILE = 'assets/joins/Merged Caravan English Videos List.csv'
 
-def main():
-    # Load the two Excel files
-    main_df = pd.read_excel('assets/Caravan English Video RAG List.xlsx')
-    tags_df = pd.read_excel('assets/Caravan English Videos List (1-7-2026) Tags.xlsx')
-
-    sub_tags_df = tags_df[['Vimeo Link', 'Series', 'Transcripts', 'Tag_01', 'Tag_02', 'Tag_03', 'Tag_04', 'Tag_05', 'Tag_06', 'Tag_07', 'Tag_08', 'Tag_09', 'Tag_10']]
+# Columns joined on from the Tags workbook
+JOINED_COLUMNS = ['Series', 'Transcripts'] + [f"Tag_{n:02d}" for n in range(1, catalog.MAX_TAGS + 1)]
 
 
+def joined_values(row):
+    """Series, Transcripts and Tag_01..Tag_10 from a catalog row, blank if there is none"""
+    if row is None:
+        return [None] * len(JOINED_COLUMNS)
+    tags = json.loads(row['tags']) if row['tags'] else []
+    return [row['series'], row['transcript']] + (tags + [None] * catalog.MAX_TAGS)[:catalog.MAX_TAGS]
 
-    main_df_filtered = main_df[pd.notnull(main_df['Vimeo Link'])]
-    sub_tags_filtered = sub_tags_df[pd.notnull(sub_tags_df['Vimeo Link'])]
-    # Diagnostic: check for duplicates
-    print(f"main_df rows: {len(main_df_filtered)}")
-    print(f"main_df unique Vimeo Links: {main_df_filtered['Vimeo Link'].nunique()}")
-    print(f"main_df duplicates: {main_df_filtered['Vimeo Link'].duplicated().sum()}")
-    print()
-    print(f"sub_tags_df rows: {len(sub_tags_filtered)}")
-    print(f"sub_tags_df unique Vimeo Links: {sub_tags_filtered['Vimeo Link'].nunique()}")
-    print(f"sub_tags_df duplicates: {sub_tags_filtered['Vimeo Link'].duplicated().sum()}")
 
+def main():
+    # Both workbooks are merged into the catalog on Vimeo ID. The Tags workbook
+    # goes first so the RAG list wins wherever both have a value, while Series,
+    # Transcripts and Tag_01..Tag_10 fill in from the Tags workbook.
+    connection = catalog.connect()
+    catalog.import_sheet(connection, TAGS_FILE, columns=catalog.TAGS_LIST_COLUMNS)
+    catalog.import_sheet(connection, RAG_FILE, columns=catalog.RAG_LIST_COLUMNS)
 
-    print(main_df_filtered['Vimeo Link'])
-    print(main_df_filtered['Vimeo Link'].unique())
-    print(main_df_filtered['Vimeo Link'].duplicated())
-
-    main_df_filtered.to_excel('assets/joins/test.xlsx', index=False)
+    print(f"Videos still missing transcripts: {len(catalog.needs_transcript(connection, RAG_FILE))}")
+    print(f"Videos still missing tags: {len(catalog.needs_tags(connection, RAG_FILE))}")
 
-    print(sub_tags_df['Vimeo Link'].duplicated())
-    # Merge the dataframes on the 'Vimeo ID' column
-    merged_df = pd.merge(main_df, sub_tags_filtered, on='Vimeo Link', how='left', indicator=True)
+    # Left join on the RAG list: every RAG row and column is kept as is, and
+    # videos that are also on the Tags workbook get its columns from the catalog
+    sheet_name = find_sheet_name(RAG_FILE, 'english video list')
+    schema = load_schema(RAG_FILE, sheet_name, {'vimeo_link': catalog.RAG_LIST_COLUMNS['vimeo_link']})
+    vimeo_col = schema.column('vimeo_link')
+    tagged = catalog.source_vimeo_ids(connection, TAGS_FILE)
 
+    headers = ()
+    for _, values in iter_rows(RAG_FILE, sheet_name, min_row=1, max_row=1):
+        headers = tuple('' if value is None else str(value) for value in values)
+    # Names on both sides get the _x / _y suffixes of the original pandas merge
+    overlap = set(headers) & set(JOINED_COLUMNS)
+    header = ([f"{name}_x" if name in overlap else name for name in headers]
+              + [f"{name}_y" if name in overlap else name for name in JOINED_COLUMNS] + ['_merge'])
 
-    # matched_rows = merged_df[merged_df['_merge'] == 'both']
-    # unmatched_rows_main = merged_df[merged_df['_merge'] != 'both']
-    
+    count = 0
+    with open(MERGED_FILE, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        for _, values in iter_rows(RAG_FILE, sheet_name):
+            if not any(value is not None for value in values):
+                continue
+            values = (list(values) + [None] * len(headers))[:len(headers)]
+            vimeo_id = catalog.vimeo_id_from_link(cell_value(values, vimeo_col))
+            row = catalog.get(connection, vimeo_id=vimeo_id) if vimeo_id in tagged else None
+            writer.writerow(values + joined_values(row) + ['both' if row else 'left_only'])
+            count += 1
 
-    # # Save the merged dataframe to CSV files
-    merged_df.to_csv('assets/joins/Merged Caravan English Videos List.csv', index=False)
-    # unmatched_rows_main.to_csv('assets/joins/Unmerged Caravan English Videos List.csv', index=False)
+    print(f"Wrote {count} rows to {MERGED_FILE}")
     print("Merged CSV files created successfully")
 
 if __name__ == '__main__':
@@ -0,0 +1,71 @@
+"""
+Tag vocabulary with a trigram index for fuzzy matching.
+
+TagIndex behaves like the old tag_lookup dict (normalized tag -> original
+tag). It also keeps an inverted index from character trigrams to tags, built
+once when Tags.csv is loaded. closest() uses that index to shortlist the few
+tags that share enough trigrams with the query, then scores only those with
+difflib's ratio. The shortlist bound is derived from the cutoff, so it never
+drops a tag that difflib.get_close_matches would have returned, and the
+result is the same. When the bound allows a match that shares no trigram at
+all (low cutoffs, very short queries), every tag is scored instead.
+"""
+
+import difflib
+import math
+
+
+def trigrams(text):
+    """Distinct character trigrams of text, padded so short tags still have some"""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TagIndex(dict):
+    """Normalized tag -> original tag, with a trigram index over the keys"""
+
+    def __init__(self, tag_lookup):
+        super().__init__(tag_lookup)
+        self.postings = {}
+        for tag in self:
+            for gram in trigrams(tag):
+                self.postings.setdefault(gram, []).append(tag)
+
+    def closest(self, query, cutoff=0.95):
+        """
+        Best tag with difflib similarity >= cutoff, or None.
+
+        Same answer as difflib.get_close_matches(query, list(self), n=1, cutoff=cutoff).
+        """
+        query_grams = trigrams(query)
+        shared = {}
+        for gram in query_grams:
+            for tag in self.postings.get(gram, ()):
+                shared[tag] = shared.get(tag, 0) + 1
+
+        # ratio = 2*M / (len(a) + len(b)) >= cutoff bounds the characters left
+        # unmatched across both strings; each one can break at most 3 of the
+        # query's trigrams
+        max_length = len(query) * 2 / cutoff
+        unmatched = math.floor((1 - cutoff) * max_length + 1e-9)
+        min_shared = len(query_grams) - 3 * unmatched
+        if min_shared > 0:
+            candidates = shared.items()
+        else:
+            # Low cutoffs or short queries: even a tag sharing no trigram may match
+            candidates = ((tag, shared.get(tag, 0)) for tag in self)
+
+        matcher = difflib.SequenceMatcher()
+        matcher.set_seq2(query)
+        best = None
+        for tag, count in candidates:
+            if count < min_shared or len(tag) + len(query) > max_length:
+                continue
+            matcher.set_seq1(tag)
+            if matcher.real_quick_ratio() >= cutoff and matcher.quick_ratio() >= cutoff:
+                score = matcher.ratio()
+                # Ties go to the larger string, as in get_close_matches
+                if score >= cutoff and (best is None or (score, tag) > best):
+                    best = (score, tag)
+
+        return best[1] if best else None